@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-16 09:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nodes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='volunteernode',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['health_status', 'broken_since'], name='node_broken_since_idx'),
+        ),
+    ]
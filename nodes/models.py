@@ -3,7 +3,10 @@ Django models for Volunteer Nodes.
 """
 
 import secrets
+from django.conf import settings
+from django.core.cache import cache
 from django.db import models
+from django.db.models import Count, Q
 from django.utils import timezone
 
 
@@ -46,6 +49,11 @@ class VolunteerNode(models.Model):
         ordering = ['-updated_at']
         indexes = [
             models.Index(fields=['health_status', '-updated_at']),
+            models.Index(
+                fields=['health_status', 'broken_since'],
+                name='node_broken_since_idx',
+                condition=models.Q(is_deleted=False),
+            ),
         ]
 
     def __str__(self):
@@ -57,6 +65,7 @@ class VolunteerNode(models.Model):
         if not self.last_check_in_at:
             self.last_check_in_at = timezone.now()
         super().save(*args, **kwargs)
+        self.invalidate_cache()
 
     def soft_delete(self):
         """Soft delete the node."""
@@ -92,22 +101,63 @@ class VolunteerNode(models.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
         }
 
+    # Columns rendered in the public node list
+    PUBLIC_FIELDS = (
+        'reddit_username', 'location', 'system_details', 'availability',
+        'bandwidth_notes', 'notes', 'health_status', 'last_check_in_at', 'updated_at',
+    )
+
+    # Cache key and size for the public node list; cleared whenever a node is written
+    ACTIVE_NODES_CACHE_KEY = 'volunteer_nodes_active'
+    ACTIVE_NODES_CACHE_SIZE = 30
+
     @classmethod
     def get_active_nodes(cls, limit=12):
-        """Get active/pending nodes for public display."""
-        return cls.objects.filter(
+        """
+        Get active/pending nodes for public display (public columns only).
+
+        The newest ACTIVE_NODES_CACHE_SIZE nodes are cached as one list and
+        sliced per caller, so every page view does not re-run the query.
+        """
+        nodes = cls.objects.filter(
             is_deleted=False
         ).exclude(
             health_status=cls.HealthStatus.BROKEN
-        ).order_by('-updated_at')[:limit]
+        ).only(*cls.PUBLIC_FIELDS).order_by('-updated_at')
+        if limit > cls.ACTIVE_NODES_CACHE_SIZE:
+            return list(nodes[:limit])
+
+        cached = cache.get(cls.ACTIVE_NODES_CACHE_KEY)
+        if cached is None:
+            cached = list(nodes[:cls.ACTIVE_NODES_CACHE_SIZE])
+            cache.set(cls.ACTIVE_NODES_CACHE_KEY, cached, getattr(settings, 'CACHE_TIMEOUT_STATS', 60))
+        return cached[:limit]
+
+    # Cache key for get_stats(); cleared whenever a node is written
+    STATS_CACHE_KEY = 'volunteer_node_stats'
 
     @classmethod
     def get_stats(cls):
-        """Get node statistics."""
-        qs = cls.objects.filter(is_deleted=False)
-        return {
-            'total': qs.count(),
-            'active': qs.filter(health_status=cls.HealthStatus.ACTIVE).count(),
-            'pending': qs.filter(health_status=cls.HealthStatus.PENDING).count(),
-            'broken': qs.filter(health_status=cls.HealthStatus.BROKEN).count(),
-        }
+        """
+        Get node statistics with caching.
+
+        All four counts come from one aggregate query instead of one COUNT
+        each, and are cached since nodes change rarely.
+        """
+        stats = cache.get(cls.STATS_CACHE_KEY)
+        if stats is not None:
+            return stats
+
+        stats = cls.objects.filter(is_deleted=False).aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(health_status=cls.HealthStatus.ACTIVE)),
+            pending=Count('id', filter=Q(health_status=cls.HealthStatus.PENDING)),
+            broken=Count('id', filter=Q(health_status=cls.HealthStatus.BROKEN)),
+        )
+        cache.set(cls.STATS_CACHE_KEY, stats, getattr(settings, 'CACHE_TIMEOUT_STATS', 60))
+        return stats
+
+    @classmethod
+    def invalidate_cache(cls):
+        """Drop cached node data after a write."""
+        cache.delete_many([cls.STATS_CACHE_KEY, cls.ACTIVE_NODES_CACHE_KEY])
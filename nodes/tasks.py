@@ -0,0 +1,69 @@
+"""
+Celery tasks for volunteer nodes.
+"""
+
+import logging
+from email.message import EmailMessage
+
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+
+from reddit_analyzer.mail import email_configured, send_message
+from .models import VolunteerNode
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60, ignore_result=True)
+def send_manage_link_email(self, node_id: int, manage_link: str):
+    """
+    Email a volunteer their private manage link.
+
+    Runs on a worker so the join form responds without waiting on SMTP.
+    Records manage_token_sent_at once the message is accepted.
+    """
+    email = VolunteerNode.objects.filter(
+        pk=node_id, is_deleted=False
+    ).values_list('email', flat=True).first()
+    if not email:
+        logger.debug("Node %s is gone; skipping manage link email", node_id)
+        return
+
+    try:
+        sent = send_node_email(email, manage_link)
+    except Exception as e:
+        logger.warning("Failed to send manage link for node %s: %s", node_id, e)
+        raise self.retry(exc=e)
+
+    if sent:
+        VolunteerNode.objects.filter(pk=node_id).update(manage_token_sent_at=timezone.now())
+
+
+def send_node_email(recipient, manage_link):
+    """
+    Send the management link email.
+
+    Returns False when email is not configured; SMTP errors are raised.
+    """
+    if not recipient or not manage_link or not email_configured():
+        return False
+
+    message = EmailMessage()
+    sender = settings.NODE_EMAIL_SENDER
+    if settings.NODE_EMAIL_SENDER_NAME:
+        sender = f"{settings.NODE_EMAIL_SENDER_NAME} <{settings.NODE_EMAIL_SENDER}>"
+    message['From'] = sender
+    message['To'] = recipient
+    message['Subject'] = 'Your Sub Search volunteer node link'
+    message.set_content(
+        f"Thanks for offering your machine to help grow the Sub Search dataset!\n\n"
+        f"Here is your private link to manage your node:\n"
+        f"{manage_link}\n\n"
+        f"Use it to update hardware details, pause contributions, or delete the node entirely.\n"
+        f"We keep nodes that report a broken state for 7+ days automatically cleared out each night.\n\n"
+        f"- Sub Search"
+    )
+
+    send_message(message)
+    return True
@@ -4,9 +4,7 @@ Django views for volunteer nodes with input sanitization.
 
 import logging
 import re
-import smtplib
-import ssl
-from email.message import EmailMessage
+from functools import lru_cache
 
 from django.conf import settings
 from django.contrib import messages
@@ -15,16 +13,37 @@ from django.urls import reverse
 from django.utils import timezone
 from django.views.decorators.http import require_http_methods
 
+from reddit_analyzer.mail import email_configured
 from reddit_analyzer.middleware import InputSanitizer
 from .models import VolunteerNode
+from .tasks import send_manage_link_email, send_node_email
 
 logger = logging.getLogger(__name__)
 
+# Manage tokens (secrets.token_urlsafe) are validated before any database lookup
+MANAGE_TOKEN_RE = re.compile(r'^[A-Za-z0-9_-]{32,64}$')
+
+# Free-text node fields and their maximum lengths
+NODE_TEXT_FIELDS = (
+    ('location', 128),
+    ('system_details', 500),
+    ('availability', 128),
+    ('bandwidth_notes', 128),
+    ('notes', 500),
+)
+
+# Blank join form, shared by every GET and reset after a successful join
+EMPTY_NODE_FORM = {
+    'email': '',
+    'reddit_username': '',
+    **{field: '' for field, _ in NODE_TEXT_FIELDS},
+}
+
 
 def nodes_home(request):
     """List all volunteer nodes."""
     stats = VolunteerNode.get_stats()
-    volunteer_nodes = list(VolunteerNode.get_active_nodes(limit=30))
+    volunteer_nodes = VolunteerNode.get_active_nodes(limit=30)
 
     return render(request, 'nodes/index.html', {
         'node_stats': stats,
@@ -36,44 +55,14 @@ def nodes_home(request):
 @require_http_methods(['GET', 'POST'])
 def node_join(request):
     """Join as a volunteer node with input sanitization."""
-    form_data = {
-        'email': '',
-        'reddit_username': '',
-        'location': '',
-        'system_details': '',
-        'availability': '',
-        'bandwidth_notes': '',
-        'notes': '',
-    }
+    form_data = EMPTY_NODE_FORM
     manage_link = None
     email_sent = False
 
     if request.method == 'POST':
         # Sanitize all inputs
-        raw_email = (request.POST.get('email') or '').strip()
-        sanitized_email = InputSanitizer.sanitize_email(raw_email)
-
-        form_data = {
-            'email': raw_email,  # Keep original for redisplay
-            'reddit_username': InputSanitizer.sanitize_username(
-                request.POST.get('reddit_username') or ''
-            ),
-            'location': InputSanitizer.sanitize_text(
-                request.POST.get('location') or '', max_length=128
-            ),
-            'system_details': InputSanitizer.sanitize_text(
-                request.POST.get('system_details') or '', max_length=500
-            ),
-            'availability': InputSanitizer.sanitize_text(
-                request.POST.get('availability') or '', max_length=128
-            ),
-            'bandwidth_notes': InputSanitizer.sanitize_text(
-                request.POST.get('bandwidth_notes') or '', max_length=128
-            ),
-            'notes': InputSanitizer.sanitize_text(
-                request.POST.get('notes') or '', max_length=500
-            ),
-        }
+        form_data = _read_node_form(request.POST)
+        sanitized_email = InputSanitizer.sanitize_email(form_data['email'])
 
         errors = []
         if not sanitized_email:
@@ -86,24 +75,14 @@ def node_join(request):
                 messages.error(request, err)
         else:
             try:
-                node = VolunteerNode.objects.create(
-                    email=sanitized_email,
-                    reddit_username=form_data['reddit_username'],
-                    location=form_data['location'],
-                    system_details=form_data['system_details'],
-                    availability=form_data['availability'],
-                    bandwidth_notes=form_data['bandwidth_notes'],
-                    notes=form_data['notes'],
-                )
+                node = VolunteerNode.objects.create(**{**form_data, 'email': sanitized_email})
                 manage_link = _build_manage_link(request, node.manage_token)
-                email_sent = _send_node_email(sanitized_email, manage_link)
+                email_sent = _queue_node_email(node, manage_link)
 
                 if email_sent:
-                    node.manage_token_sent_at = timezone.now()
-                    node.save(update_fields=['manage_token_sent_at'])
                     messages.success(
                         request,
-                        "Thanks for volunteering! Check your inbox for the private link."
+                        "Thanks for volunteering! Your private link will arrive in your inbox shortly."
                     )
                 else:
                     messages.warning(
@@ -111,7 +90,7 @@ def node_join(request):
                         "Thanks for volunteering! Copy the private link below to manage your node."
                     )
 
-                form_data = {key: '' for key in form_data}
+                form_data = EMPTY_NODE_FORM
             except Exception as e:
                 logger.exception("Failed to create volunteer node: %s", e)
                 messages.error(request, "Failed to register node. Please try again.")
@@ -127,8 +106,8 @@ def node_join(request):
 @require_http_methods(['GET', 'POST'])
 def node_manage(request, token):
     """Manage a volunteer node with token validation and input sanitization."""
-    # Validate token format (should be UUID-like hex string)
-    if not token or not re.match(r'^[a-fA-F0-9]{32,64}$', token):
+    # Validate token format (URL-safe base64) so junk never reaches the DB
+    if not token or not MANAGE_TOKEN_RE.match(token):
         messages.error(request, "Invalid node token.")
         return redirect('node_join')
 
@@ -150,27 +129,8 @@ def node_manage(request, token):
             return redirect('nodes_home')
 
         # Sanitize all inputs
-        raw_email = (request.POST.get('email') or '').strip()
-        sanitized_email = InputSanitizer.sanitize_email(raw_email)
-
-        updated_username = InputSanitizer.sanitize_username(
-            request.POST.get('reddit_username') or ''
-        )
-        updated_location = InputSanitizer.sanitize_text(
-            request.POST.get('location') or '', max_length=128
-        )
-        updated_system = InputSanitizer.sanitize_text(
-            request.POST.get('system_details') or '', max_length=500
-        )
-        updated_availability = InputSanitizer.sanitize_text(
-            request.POST.get('availability') or '', max_length=128
-        )
-        updated_bandwidth = InputSanitizer.sanitize_text(
-            request.POST.get('bandwidth_notes') or '', max_length=128
-        )
-        updated_notes = InputSanitizer.sanitize_text(
-            request.POST.get('notes') or '', max_length=500
-        )
+        form_data = _read_node_form(request.POST)
+        sanitized_email = InputSanitizer.sanitize_email(form_data['email'])
 
         # Validate and sanitize health status
         chosen_status = request.POST.get('health_status', '').strip()
@@ -181,30 +141,21 @@ def node_manage(request, token):
         errors = []
         if not sanitized_email:
             errors.append("A valid email is required.")
-        if not updated_username:
+        if not form_data['reddit_username']:
             errors.append("Your Reddit username helps coordinate API access.")
 
         if errors:
             for err in errors:
                 messages.error(request, err)
             # Update node object for redisplay (use raw values)
-            node.email = raw_email
-            node.reddit_username = updated_username
-            node.location = updated_location
-            node.system_details = updated_system
-            node.availability = updated_availability
-            node.bandwidth_notes = updated_bandwidth
-            node.notes = updated_notes
+            for field, value in form_data.items():
+                setattr(node, field, value)
             node.health_status = chosen_status
         else:
             # Apply sanitized updates
+            for field, value in form_data.items():
+                setattr(node, field, value)
             node.email = sanitized_email
-            node.reddit_username = updated_username
-            node.location = updated_location
-            node.system_details = updated_system
-            node.availability = updated_availability
-            node.bandwidth_notes = updated_bandwidth
-            node.notes = updated_notes
 
             # Handle status changes
             previous_status = node.health_status
@@ -236,60 +187,67 @@ def node_manage(request, token):
     })
 
 
-def _normalize_username(value):
-    """Normalize Reddit username by removing /u/ or u/ prefix."""
-    if not value:
-        return ''
-    cleaned = value.strip()
-    lowered = cleaned.lower()
-    if lowered.startswith('/u/'):
-        cleaned = cleaned[3:]
-    elif lowered.startswith('u/'):
-        cleaned = cleaned[2:]
-    return cleaned.strip().lstrip('/')
+def _read_node_form(post):
+    """Read and sanitize the volunteer node form fields from POST data."""
+    form_data = {
+        'email': (post.get('email') or '').strip(),  # Keep original for redisplay
+        'reddit_username': InputSanitizer.sanitize_username(post.get('reddit_username') or ''),
+    }
+    for field, max_length in NODE_TEXT_FIELDS:
+        form_data[field] = InputSanitizer.sanitize_text(post.get(field) or '', max_length=max_length)
+    return form_data
+
+
+@lru_cache(maxsize=1)
+def _manage_path_parts():
+    """
+    Split the node_manage URL around its token, resolved once.
+
+    Tokens are URL-safe, so links can be built by concatenation instead of
+    reversing the route for every link.
+    """
+    placeholder = 'TOKEN'
+    return tuple(reverse('node_manage', kwargs={'token': placeholder}).split(placeholder, 1))
 
 
 def _build_manage_link(request, token):
     """Build the full management link URL."""
     if not token:
         return ''
-    path = reverse('node_manage', kwargs={'token': token})
+    prefix, suffix = _manage_path_parts()
+    path = f"{prefix}{token}{suffix}"
     if settings.SITE_URL:
         return f"{settings.SITE_URL.rstrip('/')}{path}"
     return request.build_absolute_uri(path)
 
 
-def _send_node_email(recipient, manage_link):
-    """Send the management link email."""
-    if not recipient or not manage_link:
-        return False
-    if not settings.NODE_EMAIL_SENDER or not settings.NODE_EMAIL_SMTP_HOST:
-        return False
-
-    message = EmailMessage()
-    sender = settings.NODE_EMAIL_SENDER
-    if settings.NODE_EMAIL_SENDER_NAME:
-        sender = f"{settings.NODE_EMAIL_SENDER_NAME} <{settings.NODE_EMAIL_SENDER}>"
-    message['From'] = sender
-    message['To'] = recipient
-    message['Subject'] = 'Your Sub Search volunteer node link'
-    message.set_content(
-        f"Thanks for offering your machine to help grow the Sub Search dataset!\n\n"
-        f"Here is your private link to manage your node:\n"
-        f"{manage_link}\n\n"
-        f"Use it to update hardware details, pause contributions, or delete the node entirely.\n"
-        f"We keep nodes that report a broken state for 7+ days automatically cleared out each night.\n\n"
-        f"- Sub Search"
-    )
+def _queue_node_email(node, manage_link):
+    """
+    Hand the manage-link email to a worker; returns False if it can't be sent.
 
+    With the in-memory broker (or eager tasks) no worker will pick the task up,
+    so the email is sent inline instead.
+    """
+    if not email_configured():
+        return False
+    if _email_sent_inline():
+        try:
+            sent = send_node_email(node.email, manage_link)
+        except Exception as e:
+            logger.warning("Failed to send manage link email for node %s: %s", node.pk, e)
+            return False
+        if sent:
+            VolunteerNode.objects.filter(pk=node.pk).update(manage_token_sent_at=timezone.now())
+        return sent
     try:
-        with smtplib.SMTP(settings.NODE_EMAIL_SMTP_HOST, settings.NODE_EMAIL_SMTP_PORT, timeout=20) as smtp:
-            if settings.NODE_EMAIL_USE_TLS:
-                context = ssl.create_default_context()
-                smtp.starttls(context=context)
-            if settings.NODE_EMAIL_SMTP_USERNAME:
-                smtp.login(settings.NODE_EMAIL_SMTP_USERNAME, settings.NODE_EMAIL_SMTP_PASSWORD)
-            smtp.send_message(message)
+        send_manage_link_email.delay(node.pk, manage_link)
         return True
-    except Exception:
+    except Exception as e:
+        logger.warning("Failed to queue manage link email for node %s: %s", node.pk, e)
         return False
+
+
+def _email_sent_inline():
+    """True when no Celery worker will consume queued email tasks."""
+    broker = getattr(settings, 'CELERY_BROKER_URL', '') or ''
+    return broker.startswith('memory://') or getattr(settings, 'CELERY_TASK_ALWAYS_EAGER', False)
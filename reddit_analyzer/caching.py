@@ -0,0 +1,15 @@
+"""
+Helpers for reasoning about the configured Django cache.
+"""
+
+from django.conf import settings
+
+
+def cache_is_shared():
+    """
+    Whether the default cache is visible to both web and worker processes.
+
+    LocMemCache lives inside each process, so writes and invalidations made
+    by a Celery worker never reach the web process.
+    """
+    return 'locmem' not in settings.CACHES['default']['BACKEND'].lower()
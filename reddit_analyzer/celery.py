@@ -13,54 +13,13 @@ from django.conf import settings
 # Set the default Django settings module
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'reddit_analyzer.settings')
 
-# Redis URL from environment, fallback to memory broker
-REDIS_URL = os.environ.get('REDIS_URL', os.environ.get('CELERY_BROKER_URL', ''))
-
-
-def get_broker_url():
-    """Get the broker URL, falling back to memory if Redis is not available."""
-    if REDIS_URL:
-        return REDIS_URL
-    # Try to connect to default Redis
-    try:
-        import redis
-        r = redis.Redis(host='localhost', port=6379, socket_timeout=1)
-        r.ping()
-        return 'redis://localhost:6379/0'
-    except Exception:
-        pass
-    # Fallback to memory broker (not recommended for production)
-    return 'memory://'
-
-
-def get_result_backend():
-    """Get the result backend, using Redis if available or Django DB."""
-    if REDIS_URL:
-        return REDIS_URL
-    try:
-        import redis
-        r = redis.Redis(host='localhost', port=6379, socket_timeout=1)
-        r.ping()
-        return 'redis://localhost:6379/0'
-    except Exception:
-        pass
-    # Fallback to Django database backend
-    return 'django-db'
-
-
 app = Celery('reddit_analyzer')
 
-# Configure Celery
+# Configure Celery. Broker and result backend come from CELERY_BROKER_URL /
+# CELERY_RESULT_BACKEND in settings, which probe Redis once at startup.
 app.config_from_object('django.conf:settings', namespace='CELERY')
 
-# Override broker and backend with our detection logic
-broker_url = get_broker_url()
-result_backend = get_result_backend()
-
 app.conf.update(
-    broker_url=broker_url,
-    result_backend=result_backend,
-
     # Task priority settings
     task_default_priority=5,
     task_queue_max_priority=10,
@@ -77,6 +36,8 @@ app.conf.update(
         'search.tasks.run_random_search': {'queue': 'search'},
         'search.tasks.cleanup_stale_jobs': {'queue': 'cleanup'},
         'search.tasks.cleanup_broken_nodes': {'queue': 'cleanup'},
+        # Emails get their own worker so they never wait behind a search
+        'nodes.tasks.send_manage_link_email': {'queue': 'email'},
     },
 
     # Concurrency settings
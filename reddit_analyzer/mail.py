@@ -0,0 +1,129 @@
+"""
+Shared SMTP session for outgoing email.
+
+Volunteer node manage links and search completion notifications both send
+through the NODE_EMAIL_* SMTP settings.
+"""
+
+import atexit
+import smtplib
+import ssl
+import threading
+import time
+from functools import lru_cache
+
+from django.conf import settings
+
+# One authenticated SMTP session per thread, reused across sends so bursts
+# of messages skip the TCP + TLS + AUTH handshake after the first one.
+_smtp_local = threading.local()
+# Every open session, so they can be closed cleanly at interpreter exit
+_open_sessions = set()
+_open_sessions_lock = threading.Lock()
+SMTP_MAX_IDLE_SECONDS = 100
+SMTP_TIMEOUT_SECONDS = 20
+
+
+@lru_cache(maxsize=1)
+def email_configured():
+    """Whether a sender and SMTP host are configured (fixed for the process)."""
+    return bool(settings.NODE_EMAIL_SENDER and settings.NODE_EMAIL_SMTP_HOST)
+
+
+def send_message(message):
+    """
+    Send an email.message.Message over this thread's SMTP session.
+
+    If the server dropped an idle session the send is retried once on a
+    fresh connection. On any other failure the session is dropped, so the
+    next send reconnects, and the exception is re-raised for the caller.
+    """
+    try:
+        get_smtp().send_message(message)
+    except smtplib.SMTPServerDisconnected:
+        discard_smtp()
+        try:
+            get_smtp().send_message(message)
+        except Exception:
+            discard_smtp()
+            raise
+    except Exception:
+        discard_smtp()
+        raise
+    _smtp_local.last_used = time.monotonic()
+
+
+def get_smtp():
+    """Return a live SMTP connection for this thread, reconnecting if needed."""
+    smtp = getattr(_smtp_local, 'smtp', None)
+    if smtp is not None:
+        idle = time.monotonic() - getattr(_smtp_local, 'last_used', 0.0)
+        if idle < SMTP_MAX_IDLE_SECONDS:
+            try:
+                if smtp.noop()[0] == 250:
+                    return smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+        discard_smtp()
+
+    smtp = _connect()
+    with _open_sessions_lock:
+        _open_sessions.add(smtp)
+    _smtp_local.smtp = smtp
+    _smtp_local.last_used = time.monotonic()
+    return smtp
+
+
+def discard_smtp():
+    """Close and forget this thread's SMTP connection."""
+    smtp = getattr(_smtp_local, 'smtp', None)
+    _smtp_local.smtp = None
+    if smtp is None:
+        return
+    with _open_sessions_lock:
+        _open_sessions.discard(smtp)
+    _quit(smtp)
+
+
+def _quit(smtp):
+    """End an SMTP session politely, falling back to closing the socket."""
+    try:
+        smtp.quit()
+    except Exception:
+        smtp.close()
+
+
+@atexit.register
+def _close_all_sessions():
+    """Send QUIT on every open session when the process exits."""
+    with _open_sessions_lock:
+        sessions = list(_open_sessions)
+        _open_sessions.clear()
+    for smtp in sessions:
+        _quit(smtp)
+
+
+def _connect():
+    """Open and authenticate a new SMTP connection."""
+    host = settings.NODE_EMAIL_SMTP_HOST
+    port = settings.NODE_EMAIL_SMTP_PORT
+
+    # NODE_EMAIL_USE_SSL selects implicit TLS; otherwise the connection is
+    # plain SMTP, upgraded with STARTTLS when NODE_EMAIL_USE_TLS is on
+    use_ssl = settings.NODE_EMAIL_USE_SSL
+    if use_ssl:
+        smtp = smtplib.SMTP_SSL(
+            host, port, timeout=SMTP_TIMEOUT_SECONDS, context=ssl.create_default_context()
+        )
+    else:
+        smtp = smtplib.SMTP(host, port, timeout=SMTP_TIMEOUT_SECONDS)
+
+    try:
+        if settings.NODE_EMAIL_USE_TLS and not use_ssl:
+            smtp.starttls(context=ssl.create_default_context())
+        if settings.NODE_EMAIL_SMTP_USERNAME:
+            smtp.login(settings.NODE_EMAIL_SMTP_USERNAME, settings.NODE_EMAIL_SMTP_PASSWORD)
+    except Exception:
+        smtp.close()
+        raise
+    return smtp
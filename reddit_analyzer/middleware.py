@@ -11,10 +11,10 @@ Provides:
 import hashlib
 import json
 import logging
+import re
 import time
 import traceback
 from collections import defaultdict
-from datetime import datetime, timedelta
 from functools import lru_cache
 from threading import Lock
 
@@ -44,6 +44,8 @@ class RateLimitMiddleware:
     # In-memory storage for rate limiting (use Redis in production)
     _rate_limits = defaultdict(list)
     _lock = Lock()
+    _last_sweep = 0.0
+    SWEEP_INTERVAL = 60  # Seconds between evictions of idle clients
 
     # Rate limit configurations
     RATE_LIMITS = {
@@ -56,8 +58,8 @@ class RateLimitMiddleware:
         self.get_response = get_response
 
     def __call__(self, request):
-        # Skip rate limiting for static files and admin
-        if request.path.startswith(('/static/', '/admin/')):
+        # Skip rate limiting for static files, admin and the favicon
+        if request.path.startswith(('/static/', '/admin/')) or request.path == '/favicon.ico':
             return self.get_response(request)
 
         client_ip = self._get_client_ip(request)
@@ -107,22 +109,25 @@ class RateLimitMiddleware:
         window = config['window']
         max_requests = config['requests']
 
-        # Try to use cache (Redis) first, fall back to in-memory
+        # Try to use cache (Redis) first, fall back to in-memory.
+        # add() only creates the counter (with its TTL) when missing and
+        # incr() is atomic, so concurrent requests need no process lock.
         try:
-            # Use Redis-based rate limiting if available
-            if hasattr(cache, 'incr'):
-                count = cache.get(key, 0)
-                if count >= max_requests:
-                    return False
-                cache.incr(key, 1)
-                if count == 0:
-                    cache.expire(key, window)
-                return True
+            cache.add(key, 0, window)
+            try:
+                count = cache.incr(key)
+            except ValueError:
+                # Counter expired between add() and incr()
+                cache.set(key, 1, window)
+                count = 1
+            return count <= max_requests
         except Exception:
             pass
 
         # Fallback to in-memory rate limiting
         with self._lock:
+            self._sweep_expired(now)
+
             # Clean old entries
             cutoff = now - window
             self._rate_limits[key] = [t for t in self._rate_limits[key] if t > cutoff]
@@ -133,6 +138,22 @@ class RateLimitMiddleware:
             self._rate_limits[key].append(now)
             return True
 
+    @classmethod
+    def _sweep_expired(cls, now):
+        """
+        Drop in-memory entries for clients with no requests in the longest window.
+
+        Keys are otherwise only pruned when the same client returns, so the
+        dict would grow with every distinct IP. Caller must hold _lock.
+        """
+        if now - cls._last_sweep < cls.SWEEP_INTERVAL:
+            return
+        cls._last_sweep = now
+
+        cutoff = now - max(config['window'] for config in cls.RATE_LIMITS.values())
+        for key in [k for k, times in cls._rate_limits.items() if not times or times[-1] <= cutoff]:
+            del cls._rate_limits[key]
+
 
 # =============================================================================
 # GitHub Issue Creation for 5xx Errors
@@ -192,6 +213,14 @@ class ErrorReportingMiddleware:
 
     def _is_recently_reported(self, error_hash):
         """Check if this error was recently reported."""
+        # cache.add() is an atomic check-and-set shared by all workers, so
+        # no process lock is needed and workers don't each file the issue
+        try:
+            return not cache.add(f"error_reported:{error_hash}", True, self.DEDUP_WINDOW)
+        except Exception:
+            pass
+
+        # Fallback to in-memory deduplication
         now = time.time()
         with self._lock:
             # Clean old entries
@@ -221,7 +250,7 @@ class ErrorReportingMiddleware:
 **Error Type:** `{type(exception).__name__}`
 **Error Message:** `{str(exception)}`
 **Error Hash:** `{error_hash[:16]}`
-**Timestamp:** {datetime.utcnow().isoformat()}Z
+**Timestamp:** {timezone.now().isoformat()}
 
 ### Request Info
 - **Path:** `{request.path}`
@@ -313,8 +342,18 @@ class InputSanitizer:
     Utility class for sanitizing user input to prevent injection attacks.
     """
 
-    # Characters that are safe in search keywords
-    SAFE_KEYWORD_CHARS = set('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 _-')
+    # Anything outside the characters that are safe in search keywords
+    KEYWORD_UNSAFE_RE = re.compile(r'[^a-zA-Z0-9 _-]')
+
+    # Thousands separators stripped from integer input
+    NUMBER_SEPARATORS = str.maketrans('', '', ',_')
+
+    # Precompiled validation patterns
+    EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+    CONTROL_CHARS_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+    USERNAME_PREFIX_RE = re.compile(r'^/?u/', re.IGNORECASE)
+    USERNAME_UNSAFE_RE = re.compile(r'[^a-zA-Z0-9_-]')
+    JOB_ID_RE = re.compile(r'^[a-fA-F0-9]+$')
 
     # Maximum lengths for various inputs
     MAX_KEYWORD_LENGTH = 64
@@ -331,27 +370,20 @@ class InputSanitizer:
         # Limit length
         value = str(value)[:cls.MAX_KEYWORD_LENGTH]
 
-        # Remove unsafe characters
-        sanitized = ''.join(c for c in value if c in cls.SAFE_KEYWORD_CHARS)
-
-        # Normalize whitespace
-        sanitized = ' '.join(sanitized.split())
-
-        return sanitized.strip()
+        # Remove unsafe characters and normalize whitespace; split() already
+        # drops leading and trailing runs, so no separate strip() is needed
+        return ' '.join(cls.KEYWORD_UNSAFE_RE.sub('', value).split())
 
     @classmethod
     def sanitize_email(cls, value):
         """Sanitize an email address."""
-        import re
-
         if not value:
             return None
 
         value = str(value).strip()[:cls.MAX_EMAIL_LENGTH]
 
         # Basic email pattern validation
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, value):
+        if not cls.EMAIL_RE.match(value):
             return None
 
         return value.lower()
@@ -360,9 +392,9 @@ class InputSanitizer:
     def sanitize_integer(cls, value, min_val=None, max_val=None, default=0):
         """Sanitize and validate an integer value."""
         try:
-            # Handle common number formats
-            if isinstance(value, str):
-                value = value.replace(',', '').replace('_', '').strip()
+            # Handle common number formats; plain digit strings skip the copy
+            if isinstance(value, str) and not value.isdigit():
+                value = value.translate(cls.NUMBER_SEPARATORS).strip()
 
             result = int(value)
 
@@ -385,41 +417,36 @@ class InputSanitizer:
         value = str(value)[:max_len]
 
         # Remove null bytes and control characters (except newlines/tabs)
-        import re
-        value = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]', '', value)
+        value = cls.CONTROL_CHARS_RE.sub('', value)
 
         return value.strip()
 
     @classmethod
     def sanitize_username(cls, value):
         """Sanitize a Reddit username."""
-        import re
-
         if not value:
             return ''
 
         value = str(value).strip()
 
         # Remove /u/ or u/ prefix
-        value = re.sub(r'^/?u/', '', value, flags=re.IGNORECASE)
+        value = cls.USERNAME_PREFIX_RE.sub('', value)
 
         # Only allow valid Reddit username characters
-        value = re.sub(r'[^a-zA-Z0-9_-]', '', value)
+        value = cls.USERNAME_UNSAFE_RE.sub('', value)
 
         return value[:20]  # Reddit usernames max 20 chars
 
     @classmethod
     def sanitize_job_id(cls, value):
         """Sanitize a job ID (should be hex string)."""
-        import re
-
         if not value:
             return ''
 
         value = str(value).strip()[:64]
 
         # Job IDs should only contain hex characters
-        if not re.match(r'^[a-fA-F0-9]+$', value):
+        if not cls.JOB_ID_RE.match(value):
             return ''
 
         return value.lower()
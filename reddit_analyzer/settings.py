@@ -127,6 +127,7 @@ def get_database_config():
                         'sslmode': os.environ.get('DB_POSTGRES_SSLMODE', 'prefer'),
                     },
                     'CONN_MAX_AGE': 60,
+                    'CONN_HEALTH_CHECKS': True,
                 }
             except ImportError:
                 import warnings
@@ -143,13 +144,52 @@ def get_database_config():
         'NAME': db_path,
         'OPTIONS': {
             'timeout': 30,
+            # ORM queries are parameterized, so a larger per-connection
+            # statement cache lets repeated list/filter queries skip
+            # re-preparing their SQL.
+            'cached_statements': 256,
+            # WAL lets the web process read while a worker persists results,
+            # and synchronous=NORMAL syncs at checkpoints rather than on
+            # every commit (durable against app crashes, not power loss).
+            'init_command': (
+                'PRAGMA journal_mode=WAL;'
+                'PRAGMA synchronous=NORMAL;'
+                'PRAGMA temp_store=MEMORY;'
+            ),
         },
+        # Keep connections open across requests so each page view doesn't
+        # reconnect and re-run the PRAGMAs; health checks drop broken ones.
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
     }
 
 
+def get_readonly_database_config(default):
+    """
+    Build a read-only alias on the same SQLite database for pure read paths.
+
+    The file is opened normally (a mode=ro URI cannot open a WAL database
+    whose -wal/-shm files are missing) and query_only keeps readers from
+    writing. PostgreSQL gets no alias: it would double the persistent
+    connections, so reads there use the default connection.
+    """
+    if default['ENGINE'] != 'django.db.backends.sqlite3':
+        return None
+
+    config = dict(default)
+    options = dict(default.get('OPTIONS', {}))
+    options['init_command'] = 'PRAGMA query_only=1;'
+    config['OPTIONS'] = options
+    config['TEST'] = {'MIRROR': 'default'}
+    return config
+
+
 DATABASES = {
     'default': get_database_config()
 }
+_readonly_database = get_readonly_database_config(DATABASES['default'])
+if _readonly_database:
+    DATABASES['readonly'] = _readonly_database
 
 
 # Password validation
@@ -175,6 +215,9 @@ STATICFILES_DIRS = [
     BASE_DIR / 'subsearch' / 'static',
 ]
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Hashed files from the manifest are already served as immutable; this covers
+# unhashed paths (e.g. direct /static/ links) so browsers don't revalidate each view
+WHITENOISE_MAX_AGE = 0 if DEBUG else 86400
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -211,6 +254,9 @@ REDIS_URL = get_redis_url()
 if REDIS_URL:
     CELERY_BROKER_URL = REDIS_URL
     CELERY_RESULT_BACKEND = REDIS_URL
+elif os.environ.get('CELERY_BROKER_URL'):
+    CELERY_BROKER_URL = os.environ['CELERY_BROKER_URL']
+    CELERY_RESULT_BACKEND = CELERY_BROKER_URL
 else:
     # Fallback to memory broker (development only)
     CELERY_BROKER_URL = 'memory://'
@@ -314,6 +360,11 @@ REDDIT_USERNAME = os.environ.get('REDDIT_USERNAME', '')
 REDDIT_PASSWORD = os.environ.get('REDDIT_PASSWORD', '')
 REDDIT_USER_AGENT = os.environ.get('REDDIT_USER_AGENT', 'SubSearch/1.0 (self-hosted)')
 REDDIT_TIMEOUT = int(os.environ.get('REDDIT_TIMEOUT', 10))
+# Threads for parallel per-subreddit moderator/activity lookups
+REDDIT_LOOKUP_WORKERS = int(os.environ.get('REDDIT_LOOKUP_WORKERS', 4))
+# Requests per minute shared by all lookup threads, Reddit's OAuth allowance
+# by default (0 disables the spacing)
+REDDIT_LOOKUP_REQUESTS_PER_MINUTE = float(os.environ.get('REDDIT_LOOKUP_REQUESTS_PER_MINUTE', 100))
 
 # Job Queue Configuration
 MAX_CONCURRENT_JOBS = int(os.environ.get('SUBSEARCH_MAX_CONCURRENT_JOBS', 1))
@@ -341,6 +392,10 @@ NODE_EMAIL_SMTP_PORT = int(os.environ.get('NODE_EMAIL_SMTP_PORT', 587))
 NODE_EMAIL_SMTP_USERNAME = os.environ.get('NODE_EMAIL_SMTP_USERNAME', '')
 NODE_EMAIL_SMTP_PASSWORD = os.environ.get('NODE_EMAIL_SMTP_PASSWORD', '')
 NODE_EMAIL_USE_TLS = os.environ.get('NODE_EMAIL_USE_TLS', '1').lower() in ('1', 'true', 'yes')
+# Implicit TLS (SMTPS) instead of plain SMTP/STARTTLS; defaults on for port 465
+NODE_EMAIL_USE_SSL = os.environ.get(
+    'NODE_EMAIL_USE_SSL', '1' if NODE_EMAIL_SMTP_PORT == 465 else '0'
+).lower() in ('1', 'true', 'yes')
 NODE_CLEANUP_INTERVAL_SECONDS = int(os.environ.get('NODE_CLEANUP_INTERVAL_SECONDS', 86400))
 NODE_BROKEN_RETENTION_DAYS = int(os.environ.get('NODE_BROKEN_RETENTION_DAYS', 7))
 
@@ -391,6 +446,7 @@ else:
 CACHE_TIMEOUT_STATS = 60  # 1 minute for stats
 CACHE_TIMEOUT_SUBREDDITS = 300  # 5 minutes for subreddit queries
 CACHE_TIMEOUT_JOBS = 30  # 30 seconds for job status
+CACHE_TIMEOUT_QUEUE = 5  # 5 seconds for the shared queue backlog count
 
 
 # =============================================================================
@@ -2,12 +2,19 @@
 Django context processors for search app.
 """
 
+from functools import lru_cache
+
 from django.conf import settings
 
 
-def site_context(request):
-    """Add common context variables to all templates."""
-    # Config warnings
+@lru_cache(maxsize=1)
+def get_config_warnings():
+    """
+    Configuration warnings shown in the site banner.
+
+    Settings are fixed for the life of the process, so these are built once
+    instead of on every template render.
+    """
     config_warnings = []
     if not settings.REDDIT_CLIENT_ID:
         config_warnings.append("REDDIT_CLIENT_ID not configured - Reddit API calls will fail.")
@@ -15,9 +22,21 @@ def site_context(request):
         config_warnings.append("REDDIT_CLIENT_SECRET not configured - Reddit API calls will fail.")
     if settings.SECRET_KEY.startswith('dev-only'):
         config_warnings.append("SECRET_KEY not set - using insecure default. THIS IS UNSAFE FOR PRODUCTION!")
+    return tuple(config_warnings)
+
 
+@lru_cache(maxsize=1)
+def _site_globals():
+    """Process-constant template globals, built on the first render."""
     return {
         'site_url': settings.SITE_URL,
-        'config_warnings': config_warnings,
+        'config_warnings': get_config_warnings(),
         'random_search_interval': 7,  # Smart idle detection runs every 7 minutes
     }
+
+
+def site_context(request):
+    """Add common context variables to all templates."""
+    # Django copies processor output into the context, so the cached dict
+    # is never mutated by a render
+    return _site_globals()
@@ -0,0 +1,30 @@
+# Generated by Django 6.0 on 2026-10-16 09:12
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0006_remove_summarycache'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='subreddit',
+            name='search_subr_is_unmo_7c9810_idx',
+        ),
+        migrations.AddIndex(
+            model_name='subreddit',
+            index=models.Index(condition=models.Q(('is_unmoderated', True)), fields=['-subscribers'], name='subreddit_unmod_subs_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subreddit',
+            index=models.Index(condition=models.Q(('is_nsfw', False)), fields=['-subscribers'], name='subreddit_sfw_subs_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subreddit',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='subreddit_name_lower_idx'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 6.0 on 2026-10-16 10:05
+
+from django.db import migrations, models
+
+
+def fill_null_subscribers(apps, schema_editor):
+    Subreddit = apps.get_model('search', 'Subreddit')
+    Subreddit.objects.filter(subscribers__isnull=True).update(subscribers=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0007_subreddit_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='subreddit',
+            name='search_subr_last_se_76ffa1_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='subreddit',
+            name='subreddit_unmod_subs_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='subreddit',
+            name='subreddit_sfw_subs_idx',
+        ),
+        migrations.RunPython(fill_null_subscribers, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='subreddit',
+            name='subscribers',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='subreddit',
+            index=models.Index(fields=['-subscribers', '-id'], name='subreddit_subs_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subreddit',
+            index=models.Index(condition=models.Q(('is_unmoderated', True)), fields=['-subscribers', '-id'], name='subreddit_unmod_subs_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subreddit',
+            index=models.Index(condition=models.Q(('is_nsfw', False)), fields=['-subscribers', '-id'], name='subreddit_sfw_subs_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subreddit',
+            index=models.Index(fields=['last_seen_run', '-subscribers', '-id'], name='subreddit_run_subs_idx'),
+        ),
+    ]
@@ -2,9 +2,13 @@
 Django models for Reddit Sub Analyzer.
 """
 
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.functions import Lower
 from django.utils import timezone
 
+from reddit_analyzer.caching import cache_is_shared
+
 
 class QueryRun(models.Model):
     """
@@ -74,9 +78,35 @@ class QueryRun(models.Model):
             models.Index(fields=['celery_task_id']),
         ]
 
+    # Cached count of pending/queued jobs shown to status pollers
+    QUEUE_BACKLOG_CACHE_KEY = 'queue_backlog'
+
+    # Cached running average of user search duration (seconds) for queue ETAs,
+    # and the weight each newly completed search gets in it
+    AVG_JOB_TIME_CACHE_KEY = 'avg_job_time'
+    AVG_JOB_TIME_TIMEOUT = 3600
+    # Without a shared cache the worker's updates never reach the web process,
+    # so the average is recomputed from the database this often instead
+    AVG_JOB_TIME_LOCAL_TIMEOUT = 300
+    AVG_JOB_TIME_WEIGHT = 0.2
+
     def __str__(self):
         return f"{self.job_id} ({self.source})"
 
+    @staticmethod
+    def status_cache_key(job_id):
+        """Cache key for the encoded /status payload of a job."""
+        return f"job_status:{job_id}"
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'state' in update_fields:
+            # A job entered or left the queue; recount on the next poll
+            cache.delete_many([self.QUEUE_BACKLOG_CACHE_KEY, self.status_cache_key(self.job_id)])
+        else:
+            cache.delete(self.status_cache_key(self.job_id))
+
     @property
     def is_running(self):
         return self.state in (self.State.PENDING, self.State.QUEUED, self.State.RUNNING)
@@ -111,27 +141,64 @@ class QueryRun(models.Model):
             'state', 'completed_at', 'result_count', 'error', 'duration_ms'
         ])
 
+        if self.source == self.Source.SUB_SEARCH and not error and self.duration_ms is not None:
+            self._fold_into_average_job_time(self.duration_ms)
+
+    def _fold_into_average_job_time(self, duration_ms):
+        """Update the cached average job time with this run, if one is cached."""
+        if duration_ms >= 600000:  # Ignore outliers over 10 minutes
+            return
+        if not cache_is_shared():
+            return
+        avg = cache.get(self.AVG_JOB_TIME_CACHE_KEY)
+        if avg is None:
+            return
+        weight = self.AVG_JOB_TIME_WEIGHT
+        # Kept as a float so runs close to the average still move it
+        avg = (1 - weight) * avg + weight * duration_ms / 1000
+        cache.set(self.AVG_JOB_TIME_CACHE_KEY, avg, self.AVG_JOB_TIME_TIMEOUT)
+
     def mark_stopped(self):
-        """Mark the job as stopped by user."""
-        self.state = self.State.STOPPED
-        self.completed_at = timezone.now()
-        self.error = 'Stopped by user'
-        self.save(update_fields=['state', 'completed_at', 'error'])
+        """
+        Mark the job as stopped by user.
+
+        The transition is a conditional UPDATE so concurrent stop requests
+        cannot both win. Returns False if the job had already finished.
+        """
+        changes = {
+            'state': self.State.STOPPED,
+            'completed_at': timezone.now(),
+            'error': 'Stopped by user',
+        }
+        stopped = QueryRun.objects.filter(
+            pk=self.pk,
+            state__in=[self.State.PENDING, self.State.QUEUED, self.State.RUNNING],
+        ).update(**changes)
+        if not stopped:
+            return False
+        for field, value in changes.items():
+            setattr(self, field, value)
+        cache.delete_many([self.QUEUE_BACKLOG_CACHE_KEY, self.status_cache_key(self.job_id)])
+        return True
 
     def update_progress(self, checked=None, found=None, phase=None):
-        """Update progress counters."""
-        update_fields = []
-        if checked is not None:
-            self.checked_count = checked
-            update_fields.append('checked_count')
-        if found is not None:
-            self.found_count = found
-            update_fields.append('found_count')
-        if phase is not None:
-            self.progress_phase = phase
-            update_fields.append('progress_phase')
-        if update_fields:
-            self.save(update_fields=update_fields)
+        """
+        Update progress counters.
+
+        Called throughout a running search, so this issues a bare UPDATE
+        instead of going through save() and its signals, and only for
+        counters that actually changed since the last write.
+        """
+        changes = {}
+        if checked is not None and checked != self.checked_count:
+            self.checked_count = changes['checked_count'] = checked
+        if found is not None and found != self.found_count:
+            self.found_count = changes['found_count'] = found
+        if phase is not None and phase != self.progress_phase:
+            self.progress_phase = changes['progress_phase'] = phase
+        if changes:
+            QueryRun.objects.filter(pk=self.pk).update(**changes)
+            cache.delete(self.status_cache_key(self.job_id))
 
     def to_status_dict(self):
         """Return a dictionary for the status API endpoint."""
@@ -164,7 +231,9 @@ class Subreddit(models.Model):
     public_description = models.TextField(null=True, blank=True)
     url = models.URLField(max_length=256, null=True, blank=True)
 
-    subscribers = models.IntegerField(null=True, blank=True, db_index=True)
+    # Never NULL, so the default sort needs no NULLS LAST and can use the
+    # (-subscribers, -id) indexes below on every backend
+    subscribers = models.IntegerField(default=0)
     is_unmoderated = models.BooleanField(default=False, db_index=True)
     is_nsfw = models.BooleanField(default=False)
 
@@ -188,10 +257,25 @@ class Subreddit(models.Model):
     class Meta:
         ordering = ['-subscribers']
         indexes = [
-            models.Index(fields=['is_unmoderated', '-subscribers']),
+            # Subscriber indexes end in -id to match the API's (subscribers, id)
+            # keyset order, so pages are read straight off the index.
+            models.Index(fields=['-subscribers', '-id'], name='subreddit_subs_id_idx'),
+            # Partial indexes only cover the rows the list filters select,
+            # keeping the B-trees small compared to full composite indexes.
+            models.Index(
+                fields=['-subscribers', '-id'],
+                name='subreddit_unmod_subs_idx',
+                condition=models.Q(is_unmoderated=True),
+            ),
+            models.Index(
+                fields=['-subscribers', '-id'],
+                name='subreddit_sfw_subs_idx',
+                condition=models.Q(is_nsfw=False),
+            ),
+            models.Index(Lower('name'), name='subreddit_name_lower_idx'),
             models.Index(fields=['-updated_at']),
             models.Index(fields=['is_nsfw', '-subscribers']),
-            models.Index(fields=['last_seen_run', '-subscribers']),
+            models.Index(fields=['last_seen_run', '-subscribers', '-id'], name='subreddit_run_subs_idx'),
         ]
 
     def __str__(self):
@@ -215,6 +299,38 @@ class Subreddit(models.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
         }
 
+    # Maximum rows per statement in bulk_upsert()
+    UPSERT_BATCH_SIZE = 500
+
+    # Column order for values_list() rows consumed by row_to_dict()
+    API_FIELDS = (
+        'name', 'display_name_prefixed', 'title', 'public_description',
+        'url', 'subscribers', 'is_unmoderated', 'is_nsfw',
+        'last_activity_utc', 'mod_count', 'source', 'first_seen_at', 'updated_at',
+    )
+
+    @staticmethod
+    def keyword_q(keyword):
+        """Filter for subreddits whose name, title or description contains a keyword."""
+        return (
+            models.Q(name__icontains=keyword) |
+            models.Q(title__icontains=keyword) |
+            models.Q(public_description__icontains=keyword)
+        )
+
+    @classmethod
+    def row_to_dict(cls, row):
+        """
+        Build the to_dict() representation from an API_FIELDS values_list row.
+
+        Avoids instantiating a model per row on paginated API responses.
+        """
+        data = dict(zip(cls.API_FIELDS, row))
+        for key in ('first_seen_at', 'updated_at'):
+            value = data[key]
+            data[key] = value.isoformat() if value else None
+        return data
+
     @classmethod
     def upsert_from_dict(cls, data, query_run=None, keyword=None, source=None):
         """
@@ -274,7 +390,7 @@ class Subreddit(models.Model):
         Bulk create or update subreddits from a list of dictionaries.
 
         This is MUCH faster than calling upsert_from_dict() in a loop:
-        - Uses 2 queries total (one SELECT, one bulk UPDATE/CREATE) instead of 2-3 per item
+        - Uses 2 queries total (one SELECT, one INSERT ... ON CONFLICT) instead of 2-3 per item
         - For 50 subreddits: ~2-3 queries instead of ~100-150 queries
 
         Returns count of (created, updated) subreddits.
@@ -296,7 +412,7 @@ class Subreddit(models.Model):
                 'public_description': data.get('public_description') or '',
                 'url': data.get('url'),
                 'subscribers': int(data.get('subscribers') or 0),
-                'is_unmoderated': bool(data.get('is_unmoderated')),
+                'is_unmoderated': data.get('is_unmoderated'),
                 'is_nsfw': bool(data.get('is_nsfw')),
                 'last_activity_utc': data.get('last_activity_utc'),
                 'mod_count': data.get('mod_count'),
@@ -308,68 +424,84 @@ class Subreddit(models.Model):
         if not items_by_name:
             return 0, 0
 
-        from django.db.models.functions import Lower
-
-        # Find all existing records using case-insensitive matching
+        # Find all existing records using case-insensitive matching, fetching
+        # only the columns needed to address them and to keep what is already
+        # known when a lookup failed. Persist batches fit in one query; larger
+        # inputs are split to stay under SQLite's variable limit.
         name_list = list(items_by_name.keys())
         existing_subs = {}
-
-        # Query in batches to avoid very long IN clauses
-        for i in range(0, len(name_list), 100):
-            batch = name_list[i:i + 100]
-            # Annotate with lowercase name and filter
-            for sub in cls.objects.annotate(
-                name_lower=Lower('name')
-            ).filter(name_lower__in=batch):
-                existing_subs[sub.name.lower()] = sub
-
+        for i in range(0, len(name_list), cls.UPSERT_BATCH_SIZE):
+            existing_subs.update(
+                (name_lower, row)
+                for name_lower, *row in cls.objects.annotate(
+                    name_lower=Lower('name')
+                ).filter(
+                    name_lower__in=name_list[i:i + cls.UPSERT_BATCH_SIZE]
+                ).values_list(
+                    'name_lower', 'id', 'name', 'is_unmoderated', 'mod_count', 'last_activity_utc'
+                )
+            )
+
+        # Existing rows keep their stored name so the upsert below conflicts
+        # on it, whatever case the incoming name used. A moderator or activity
+        # value of None means the lookup failed, so the stored one is kept.
         to_create = []
         to_update = []
+        now = timezone.now()
 
         for name_lower, data in items_by_name.items():
             if name_lower in existing_subs:
-                # Update existing record
-                sub = existing_subs[name_lower]
-                for key, value in data.items():
-                    if key != 'name':  # Don't change the name
-                        setattr(sub, key, value)
-                to_update.append(sub)
+                pk, existing_name, *known = existing_subs[name_lower]
+                is_unmoderated, mod_count, last_activity_utc = known
+                fields = {key: value for key, value in data.items() if key != 'name'}
+                if fields['is_unmoderated'] is None:
+                    fields['is_unmoderated'] = is_unmoderated
+                    fields['mod_count'] = mod_count
+                if fields['last_activity_utc'] is None:
+                    fields['last_activity_utc'] = last_activity_utc
+                to_update.append((pk, cls(name=existing_name, updated_at=now, **fields)))
             else:
-                # Create new record
-                to_create.append(cls(**data))
+                to_create.append(cls(**{**data, 'is_unmoderated': bool(data['is_unmoderated'])}))
 
         created_count = 0
         updated_count = 0
+        update_fields = [
+            'display_name_prefixed', 'title', 'public_description', 'url',
+            'subscribers', 'is_unmoderated', 'is_nsfw', 'last_activity_utc',
+            'mod_count', 'last_keyword', 'source', 'last_seen_run', 'updated_at'
+        ]
 
-        # Bulk create new records
-        if to_create:
+        # Commit the whole batch at once; nested atomic blocks are savepoints
+        # so a failed bulk statement can still fall back to per-row writes.
+        with transaction.atomic():
             try:
-                cls.objects.bulk_create(to_create, ignore_conflicts=True)
+                # One INSERT ... ON CONFLICT (name) DO UPDATE per batch writes
+                # new and existing rows alike, instead of a bulk_update CASE
+                # expression per column
+                with transaction.atomic():
+                    cls.objects.bulk_create(
+                        to_create + [sub for _, sub in to_update],
+                        update_conflicts=True,
+                        unique_fields=['name'],
+                        update_fields=update_fields,
+                        batch_size=cls.UPSERT_BATCH_SIZE,
+                    )
                 created_count = len(to_create)
+                updated_count = len(to_update)
             except Exception:
-                # Fallback to individual creates on error
+                # Fallback to individual writes on error
                 for sub in to_create:
                     try:
-                        sub.save()
+                        with transaction.atomic():
+                            sub.save()
                         created_count += 1
                     except Exception:
                         pass
-
-        # Bulk update existing records
-        if to_update:
-            try:
-                update_fields = [
-                    'display_name_prefixed', 'title', 'public_description', 'url',
-                    'subscribers', 'is_unmoderated', 'is_nsfw', 'last_activity_utc',
-                    'mod_count', 'last_keyword', 'source', 'last_seen_run', 'updated_at'
-                ]
-                cls.objects.bulk_update(to_update, update_fields, batch_size=100)
-                updated_count = len(to_update)
-            except Exception:
-                # Fallback to individual saves on error
-                for sub in to_update:
+                for pk, sub in to_update:
                     try:
-                        sub.save()
+                        sub.pk = pk
+                        with transaction.atomic():
+                            sub.save(update_fields=update_fields)
                         updated_count += 1
                     except Exception:
                         pass
@@ -7,20 +7,30 @@ Priority levels:
 - 7-9: Automated searches (lowest priority, processed last)
 """
 
+import functools
+import itertools
 import logging
 import random
 import re
+import secrets
+import threading
 import time
-import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 import requests
 from celery import shared_task
 from celery.exceptions import SoftTimeLimitExceeded
 from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
+from django.db.models.functions import Lower
 from django.utils import timezone
 from datetime import timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from reddit_analyzer.caching import cache_is_shared
 from .models import QueryRun, Subreddit
 
 logger = logging.getLogger(__name__)
@@ -30,6 +40,33 @@ PRIORITY_USER = 0  # Highest priority for user searches
 PRIORITY_AUTO = 9  # Lowest priority for automated searches
 
 
+# Minimum seconds between stop-flag lookups while a search is running
+STOP_CHECK_SECONDS = 0.5
+
+
+def _stop_flag_key(job_id):
+    return f"job_stop:{job_id}"
+
+
+def request_stop(job_id):
+    """
+    Flag a running job to stop.
+
+    The running task checks this cache key between subreddits, so a stop
+    request is seen without reloading the QueryRun row on every iteration.
+    """
+    cache.set(_stop_flag_key(job_id), True, settings.JOB_TIMEOUT_SECONDS)
+
+
+# Bumped whenever subreddit rows are written; part of the /api/subreddits ETag
+SUBREDDITS_VERSION_KEY = 'subreddits_version'
+
+
+def get_subreddits_version():
+    """Return the current subreddit data version (0 until the first write)."""
+    return cache.get(SUBREDDITS_VERSION_KEY, 0)
+
+
 def get_reddit_config():
     """Get Reddit API configuration from Django settings."""
     return {
@@ -42,32 +79,30 @@ def get_reddit_config():
     }
 
 
-def find_unmoderated_subreddits(
-    limit=100,
-    name_keyword=None,
-    unmoderated_only=True,
-    exclude_nsfw=False,
-    min_subscribers=0,
-    activity_mode="any",
-    activity_threshold_utc=None,
-    progress_callback=None,
-    stop_callback=None,
-    rate_limit_delay=0.0,  # Deprecated - PRAW handles rate limiting
-    include_all=False,
-    exclude_names=None,
-    result_callback=None,
-):
+_reddit_client = None
+_reddit_lock = threading.Lock()
+
+
+def get_reddit():
     """
-    Connect to Reddit API and find subreddits matching the given criteria.
+    Get the shared PRAW client for this worker process.
 
-    Optimized for speed:
-    - PRAW handles rate limiting automatically (100 req/min for OAuth)
-    - Moderator lookups only happen when unmoderated_only=True
-    - Activity lookups only happen when activity filtering is enabled
-    - No manual delays between requests
+    Built lazily once so consecutive jobs reuse the HTTP session and OAuth
+    token instead of re-authenticating for every search.
     """
+    global _reddit_client
+    if _reddit_client is not None:
+        return _reddit_client
+
+    with _reddit_lock:
+        if _reddit_client is None:
+            _reddit_client = _build_reddit()
+    return _reddit_client
+
+
+def _build_reddit():
+    """Build a PRAW client from the configured credentials."""
     import praw
-    import prawcore
 
     cfg = get_reddit_config()
 
@@ -95,11 +130,169 @@ def find_unmoderated_subreddits(
             reddit.read_only = True
         except Exception:
             pass
+    return reddit
+
+
+# Most subreddits pulled from the listing per round of parallel lookups
+LOOKUP_BATCH_SIZE = 16
+# Seconds of lookups a batch may queue at the shared lookup rate, so the
+# listing (and its progress) keeps moving between batches
+LOOKUP_BATCH_SECONDS = 5
+
+_lookup_pool = None
+_lookup_limiter = None
+_lookup_pool_lock = threading.Lock()
+_lookup_local = threading.local()
+
+
+class _RequestSpacer:
+    """
+    Space requests evenly across threads so they share one rate budget.
+
+    Each lookup thread has its own PRAW client, and each client would
+    otherwise pace itself as if it had Reddit's whole allowance.
+    """
+
+    def __init__(self, per_second):
+        self.interval = 1.0 / per_second if per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        """Block until this thread's turn to send a request."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _get_lookup_pool():
+    """
+    Get the shared thread pool for per-subreddit moderator/activity lookups.
+
+    These lookups are latency-bound HTTP calls, so a handful of threads
+    overlap their round trips. The pool lives for the worker process so
+    each thread keeps its own authenticated client between jobs.
+    """
+    global _lookup_pool, _lookup_limiter
+    if _lookup_pool is not None:
+        return _lookup_pool
+
+    with _lookup_pool_lock:
+        if _lookup_pool is None:
+            _lookup_limiter = _RequestSpacer(settings.REDDIT_LOOKUP_REQUESTS_PER_MINUTE / 60)
+            _lookup_pool = ThreadPoolExecutor(
+                max_workers=settings.REDDIT_LOOKUP_WORKERS,
+                thread_name_prefix='reddit-lookup',
+            )
+    return _lookup_pool
+
+
+def _lookup_batch_size(requests_per_sub):
+    """Subreddits per lookup batch, so one batch takes about LOOKUP_BATCH_SECONDS."""
+    per_second = settings.REDDIT_LOOKUP_REQUESTS_PER_MINUTE / 60
+    if per_second <= 0 or not requests_per_sub:
+        return LOOKUP_BATCH_SIZE
+    fits = int(per_second * LOOKUP_BATCH_SECONDS / requests_per_sub)
+    return max(1, min(LOOKUP_BATCH_SIZE, fits))
+
+
+def _lookup_subreddit_extras(name, need_moderator_check, need_activity_check):
+    """
+    Fetch the real moderator count and latest post time for one subreddit.
+
+    Runs on a lookup pool thread. PRAW clients are not thread-safe, so each
+    thread uses its own client; requests from all threads are spaced by the
+    shared _lookup_limiter so together they stay within one rate budget.
+    A lookup that fails leaves its value as None (unknown).
+    """
+    import praw
+    import prawcore
+
+    reddit = getattr(_lookup_local, 'reddit', None)
+    if reddit is None:
+        reddit = _lookup_local.reddit = _build_reddit()
+    subreddit = reddit.subreddit(name)
+
+    mod_count = None
+    if need_moderator_check:
+        _lookup_limiter.wait()
+        try:
+            moderators = list(subreddit.moderator())
+            real_mods = [
+                mod for mod in moderators
+                if getattr(mod, 'name', '').lower() not in ('automoderator', '')
+            ]
+            mod_count = len(real_mods)
+        except (praw.exceptions.PRAWException, prawcore.exceptions.PrawcoreException, AttributeError):
+            mod_count = None
+
+    latest_post_utc = None
+    if need_activity_check:
+        _lookup_limiter.wait()
+        try:
+            for post in subreddit.new(limit=1):
+                latest_post_utc = getattr(post, 'created_utc', None)
+                break
+        except (praw.exceptions.PRAWException, prawcore.exceptions.PrawcoreException, AttributeError):
+            pass
+
+    return mod_count, latest_post_utc
+
+
+def _batched(iterable, size):
+    """Yield lists of up to ``size`` items from ``iterable``."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def find_unmoderated_subreddits(
+    limit=100,
+    name_keyword=None,
+    unmoderated_only=True,
+    exclude_nsfw=False,
+    min_subscribers=0,
+    activity_mode="any",
+    activity_threshold_utc=None,
+    progress_callback=None,
+    stop_callback=None,
+    rate_limit_delay=0.0,  # Deprecated - PRAW handles rate limiting
+    include_all=False,
+    exclude_names=None,
+    result_callback=None,
+    reddit=None,
+):
+    """
+    Connect to Reddit API and find subreddits matching the given criteria.
+
+    Uses the process-wide client from get_reddit() unless ``reddit`` is given.
+
+    Optimized for speed:
+    - PRAW handles rate limiting automatically (100 req/min for OAuth)
+    - Moderator lookups only happen when unmoderated_only=True
+    - Activity lookups only happen when activity filtering is enabled
+    - Those lookups run in parallel on a small thread pool
+    - No manual delays between requests
+    """
+    import praw
+    import prawcore
+
+    if reddit is None:
+        reddit = get_reddit()
 
     normalized_excludes = {name.strip().lower() for name in (exclude_names or set()) if name and name.strip()}
 
     filtered_subs = []
-    evaluated_subs = []
+    # Every evaluated sub is already handed to result_callback; only count them
+    evaluated_count = 0
     checked = 0
 
     # Determine what extra API calls we need
@@ -126,125 +319,160 @@ def find_unmoderated_subreddits(
     else:
         subreddit_iter = reddit.subreddits.new(limit=limit)
 
-    # Progress update frequency - don't update too often
-    last_progress_update = 0
-    PROGRESS_UPDATE_INTERVAL = 10
-
-    for subreddit in subreddit_iter:
-        # Check for stop signal
-        if stop_callback and stop_callback():
-            logger.info("Stop requested; ending early. Checked=%d, found=%d", checked, len(filtered_subs))
-            break
+    # Progress update frequency - coalesce to at most one write per interval
+    last_progress_update = time.monotonic()
+    PROGRESS_UPDATE_SECONDS = 0.25
+
+    def report_progress():
+        """Throttle progress updates to reduce DB writes."""
+        nonlocal last_progress_update
+        if not progress_callback:
+            return
+        now = time.monotonic()
+        if now - last_progress_update < PROGRESS_UPDATE_SECONDS:
+            return
+        last_progress_update = now
+        try:
+            progress_callback(checked=checked, found=len(filtered_subs))
+        except Exception:
+            pass
 
-        checked += 1
+    def evaluate(sub_info):
+        """Persist one looked-up subreddit and keep it if it passes the filters."""
+        nonlocal evaluated_count
 
-        # Throttle progress updates to reduce DB writes
-        if progress_callback and (checked - last_progress_update) >= PROGRESS_UPDATE_INTERVAL:
+        # Save to database via callback
+        if result_callback:
             try:
-                progress_callback(checked=checked, found=len(filtered_subs))
-                last_progress_update = checked
+                result_callback(dict(sub_info))
             except Exception:
-                pass
-
-        latest_post_utc = None
-        passes_filters = True
+                logger.debug("Result callback failed for %s", sub_info.get("name"), exc_info=True)
+
+        evaluated_count += 1
+
+        subs_count = sub_info['subscribers']
+        latest_post_utc = sub_info['last_activity_utc']
+        mod_count = sub_info['mod_count']
+
+        # Apply filters
+        if exclude_nsfw and sub_info['is_nsfw']:
+            return
+
+        if subs_count < (min_subscribers or 0):
+            return
+
+        if need_activity_check:
+            if latest_post_utc is None:
+                return
+            if activity_mode == "active_after" and latest_post_utc < activity_threshold_utc:
+                return
+            if activity_mode == "inactive_before" and latest_post_utc >= activity_threshold_utc:
+                return
+
+        if unmoderated_only and (mod_count is None or mod_count > 0):
+            return
+
+        filtered_subs.append(sub_info)
+        if unmoderated_only and sub_info.get('is_unmoderated'):
+            logger.info("Found unmoderated: %s (%s subscribers)",
+                       sub_info['display_name_prefixed'], sub_info['subscribers'])
+
+    # Moderator/activity lookups cost one HTTP round trip each, so they run on
+    # the lookup pool a batch at a time, sized to the shared lookup rate
+    requests_per_sub = int(bool(need_moderator_check)) + int(bool(need_activity_check))
+    lookup_pool = _get_lookup_pool() if requests_per_sub else None
+    batch_size = _lookup_batch_size(requests_per_sub)
+
+    stopped = False
+    for batch in _batched(subreddit_iter, batch_size):
+        candidates = []
+        for subreddit in batch:
+            # Check for stop signal
+            if stop_callback and stop_callback():
+                stopped = True
+                break
+
+            checked += 1
+            report_progress()
 
-        try:
-            # Get basic info - these are already loaded from the search response
-            display_name = getattr(subreddit, 'display_name', 'unknown')
-            display_name_prefixed = getattr(subreddit, 'display_name_prefixed', f"r/{display_name}")
-            title = getattr(subreddit, 'title', display_name)
-            public_description = getattr(subreddit, 'public_description', '') or ''
-            is_nsfw = bool(getattr(subreddit, 'over18', False))
-
-            # Skip if already in our exclude set
-            name_key = (display_name or "").strip().lower()
-            if normalized_excludes and name_key in normalized_excludes:
-                continue
-
-            # Get subscriber count (already in response, no extra API call)
-            subscribers = None
             try:
-                subscribers = subreddit.subscribers
-            except (praw.exceptions.PRAWException, prawcore.exceptions.PrawcoreException, AttributeError):
-                subscribers = None
-            subs_count = subscribers if isinstance(subscribers, int) else (subscribers or 0)
+                # Get basic info - these are already loaded from the search response
+                display_name = getattr(subreddit, 'display_name', 'unknown')
 
-            # OPTIMIZATION: Only fetch moderators if unmoderated_only filter is enabled
-            mod_count = None
-            if need_moderator_check:
-                try:
-                    moderators = list(subreddit.moderator())
-                    real_mods = [
-                        mod for mod in moderators
-                        if getattr(mod, 'name', '').lower() not in ('automoderator', '')
-                    ]
-                    mod_count = len(real_mods)
-                except (praw.exceptions.PRAWException, prawcore.exceptions.PrawcoreException, AttributeError):
-                    mod_count = None
+                # Skip if already in our exclude set
+                name_key = (display_name or "").strip().lower()
+                if normalized_excludes and name_key in normalized_excludes:
+                    continue
 
-            # OPTIMIZATION: Only fetch activity if activity filter is enabled
-            if need_activity_check:
+                # Get subscriber count (already in response, no extra API call)
+                subscribers = None
                 try:
-                    for post in subreddit.new(limit=1):
-                        latest_post_utc = getattr(post, 'created_utc', None)
-                        break
+                    subscribers = subreddit.subscribers
                 except (praw.exceptions.PRAWException, prawcore.exceptions.PrawcoreException, AttributeError):
-                    pass
-
-            # Build sub_info
-            sub_info = {
-                'name': display_name,
-                'display_name_prefixed': display_name_prefixed,
-                'title': title,
-                'public_description': public_description,
-                'subscribers': subs_count,
-                'url': f"https://reddit.com{getattr(subreddit, 'url', '/')}",
-                'is_unmoderated': bool(mod_count == 0) if mod_count is not None else None,
-                'is_nsfw': is_nsfw,
-                'mod_count': mod_count,
-                'last_activity_utc': latest_post_utc,
-            }
+                    subscribers = None
+
+                candidates.append({
+                    'name': display_name,
+                    'display_name_prefixed': getattr(subreddit, 'display_name_prefixed', f"r/{display_name}"),
+                    'title': getattr(subreddit, 'title', display_name),
+                    'public_description': getattr(subreddit, 'public_description', '') or '',
+                    'subscribers': subscribers if isinstance(subscribers, int) else (subscribers or 0),
+                    'url': f"https://reddit.com{getattr(subreddit, 'url', '/')}",
+                    'is_unmoderated': None,
+                    'is_nsfw': bool(getattr(subreddit, 'over18', False)),
+                    'mod_count': None,
+                    'last_activity_utc': None,
+                })
+            except Exception:
+                pass
 
-            # Save to database via callback
-            if result_callback:
+        if not lookup_pool:
+            for sub_info in candidates:
                 try:
-                    result_callback(dict(sub_info))
+                    evaluate(sub_info)
                 except Exception:
-                    logger.debug("Result callback failed for %s", sub_info.get("name"), exc_info=True)
-
-            evaluated_subs.append(sub_info)
-
-            # Apply filters
-            if exclude_nsfw and is_nsfw:
-                passes_filters = False
-
-            if passes_filters and subs_count < (min_subscribers or 0):
-                passes_filters = False
-
-            if passes_filters and need_activity_check:
-                if latest_post_utc is None:
-                    passes_filters = False
-                elif activity_mode == "active_after" and latest_post_utc < activity_threshold_utc:
-                    passes_filters = False
-                elif activity_mode == "inactive_before" and latest_post_utc >= activity_threshold_utc:
-                    passes_filters = False
-
-            if passes_filters and unmoderated_only:
-                if mod_count is None or mod_count > 0:
-                    passes_filters = False
-
-            if passes_filters:
-                filtered_subs.append(sub_info)
-                if unmoderated_only and sub_info.get('is_unmoderated'):
-                    logger.info("Found unmoderated: %s (%s subscribers)",
-                               sub_info['display_name_prefixed'], sub_info['subscribers'])
-
-        except Exception:
-            pass
+                    pass
+                report_progress()
+        elif candidates and not stopped:
+            # OPTIMIZATION: Only fetch moderators/activity if those filters are enabled
+            futures = {
+                lookup_pool.submit(
+                    _lookup_subreddit_extras, sub_info['name'], need_moderator_check, need_activity_check
+                ): sub_info
+                for sub_info in candidates
+            }
+            pending = set(futures)
+            while pending:
+                # Wake at least every STOP_CHECK_SECONDS so a stop request
+                # is not held up by the rest of the batch
+                done, pending = wait(pending, timeout=STOP_CHECK_SECONDS, return_when=FIRST_COMPLETED)
+                for future in done:
+                    sub_info = futures[future]
+                    try:
+                        mod_count, latest_post_utc = future.result()
+                    except Exception as e:
+                        # Keep the subreddit, with its status unknown
+                        logger.debug("Lookup failed for %s: %s", sub_info['name'], e)
+                        mod_count, latest_post_utc = None, None
+                    sub_info['mod_count'] = mod_count
+                    sub_info['is_unmoderated'] = bool(mod_count == 0) if mod_count is not None else None
+                    sub_info['last_activity_utc'] = latest_post_utc
+                    try:
+                        evaluate(sub_info)
+                    except Exception:
+                        pass
+                    report_progress()
+                if pending and stop_callback and stop_callback():
+                    stopped = True
+                    for future in pending:
+                        future.cancel()
+                    break
+
+        if stopped:
+            logger.info("Stop requested; ending early. Checked=%d, found=%d", checked, len(filtered_subs))
+            break
 
-        if checked % 100 == 0:
-            logger.debug("Progress: checked=%d found=%d", checked, len(filtered_subs))
+        logger.debug("Progress: checked=%d found=%d", checked, len(filtered_subs))
 
     # Final progress update
     if progress_callback:
@@ -258,7 +486,7 @@ def find_unmoderated_subreddits(
     if include_all:
         return {
             "results": filtered_subs,
-            "evaluated": evaluated_subs,
+            "evaluated": evaluated_count,
             "checked": checked,
         }
     return filtered_subs
@@ -284,14 +512,27 @@ def run_sub_search(self, job_id: str):
 
     # Track if we should stop
     should_stop = False
+    stop_key = _stop_flag_key(job_id)
+    # A process-local cache never sees the web process's flag, so fall
+    # back to checking the job state in the database
+    check_db_state = not cache_is_shared()
+
+    # The stop callback runs once per subreddit; only consult the cache (or
+    # database) every STOP_CHECK_SECONDS so a fast listing does not turn
+    # into a round trip per item
+    next_stop_check = 0.0
 
     def check_stop():
-        nonlocal should_stop
+        nonlocal should_stop, next_stop_check
         if should_stop:
             return True
-        # Refresh from database to check if stopped
-        query_run.refresh_from_db()
-        if query_run.state == QueryRun.State.STOPPED:
+        now = time.monotonic()
+        if now < next_stop_check:
+            return False
+        next_stop_check = now + STOP_CHECK_SECONDS
+        if cache.get(stop_key) or (check_db_state and QueryRun.objects.filter(
+            pk=query_run.pk, state=QueryRun.State.STOPPED
+        ).exists()):
             should_stop = True
             return True
         return False
@@ -300,21 +541,13 @@ def run_sub_search(self, job_id: str):
         query_run.update_progress(checked=checked, found=found, phase='api_search')
 
     # Collect results to persist
-    results_buffer = []
-    batch_size = settings.PERSIST_BATCH_SIZE
-
-    def persist_result(sub_info):
-        results_buffer.append(sub_info)
-        if len(results_buffer) >= batch_size:
-            _flush_results(query_run, results_buffer.copy())
-            results_buffer.clear()
+    persist_result = _ResultBuffer(query_run)
 
     try:
         # Query existing matches from database first
-        existing_matches = _query_existing_matches(query_run)
-        existing_names = {(row.name or '').strip().lower() for row in existing_matches}
+        existing_names = _query_existing_names(query_run)
 
-        query_run.update_progress(found=len(existing_matches), phase='api_search')
+        query_run.update_progress(found=len(existing_names), phase='api_search')
 
         # Run the search
         payload = find_unmoderated_subreddits(
@@ -334,17 +567,16 @@ def run_sub_search(self, job_id: str):
         )
 
         # Flush remaining results
-        if results_buffer:
-            _flush_results(query_run, results_buffer)
+        persist_result.flush()
 
         # Count total keyword matches in database AFTER search completes
         # This gives accurate count of all subs matching the keyword
         total_count = _count_keyword_matches(query_run.keyword)
 
         query_run.mark_complete(result_count=total_count)
-        api_evaluated = payload.get('evaluated', []) if isinstance(payload, dict) else payload
+        api_evaluated = payload.get('evaluated', 0) if isinstance(payload, dict) else len(payload)
         logger.info("Job %s completed with %d total matches in DB (%d evaluated from API)",
-                   job_id, total_count, len(api_evaluated))
+                   job_id, total_count, api_evaluated)
 
         # Send email notification if requested
         if query_run.notification_email:
@@ -353,7 +585,7 @@ def run_sub_search(self, job_id: str):
         return {
             'job_id': job_id,
             'result_count': total_count,
-            'checked': payload.get('checked', 0) if isinstance(payload, dict) else len(api_results),
+            'checked': payload.get('checked', 0) if isinstance(payload, dict) else len(payload),
         }
 
     except SoftTimeLimitExceeded:
@@ -377,32 +609,28 @@ def run_sub_search(self, job_id: str):
         return {'error': str(e)}
 
 
-def _query_existing_matches(query_run):
-    """Query database for existing subreddit matches by keyword only.
+def _query_existing_names(query_run):
+    """Query database for lowercased names of existing matches by keyword only.
 
     Note: This only matches by keyword (name/title/description).
     User filters (unmoderated, nsfw, subscribers) are NOT applied here
     because we want the result count to reflect keyword matches,
     not filtered results. Filters are applied when viewing/downloading.
-    """
-    from django.db.models import Q
-
-    qs = Subreddit.objects.all()
 
-    if query_run.keyword:
-        # Search by name, title, and description for loose keyword matching
-        keyword = query_run.keyword
-        qs = qs.filter(
-            Q(name__icontains=keyword) |
-            Q(title__icontains=keyword) |
-            Q(public_description__icontains=keyword)
-        )
-    else:
+    Matching, lowercasing and the row cap all run in SQL, so only the name
+    column is fetched instead of full Subreddit rows.
+    """
+    if not query_run.keyword:
         # No keyword means no matches from existing DB
-        return []
+        return set()
 
     # Limit to reasonable amount
-    return list(qs.order_by('-subscribers')[:5000])
+    return set(
+        Subreddit.objects.filter(Subreddit.keyword_q(query_run.keyword))
+        .order_by('-subscribers')
+        .annotate(name_lower=Lower('name'))
+        .values_list('name_lower', flat=True)[:5000]
+    )
 
 
 def _count_keyword_matches(keyword):
@@ -412,16 +640,10 @@ def _count_keyword_matches(keyword):
     name, title, or description. This is used for the final
     result count after a search completes.
     """
-    from django.db.models import Q
-
     if not keyword:
         return 0
 
-    return Subreddit.objects.filter(
-        Q(name__icontains=keyword) |
-        Q(title__icontains=keyword) |
-        Q(public_description__icontains=keyword)
-    ).count()
+    return Subreddit.objects.filter(Subreddit.keyword_q(keyword)).count()
 
 
 def _flush_results(query_run, results):
@@ -431,12 +653,40 @@ def _flush_results(query_run, results):
 
     # Use bulk upsert for much better performance
     # ~2-3 queries instead of ~100-150 queries per batch
-    return Subreddit.bulk_upsert(
+    counts = Subreddit.bulk_upsert(
         results,
         query_run=query_run,
         keyword=query_run.keyword,
         source=query_run.source
     )
+    if any(counts):
+        cache.set(SUBREDDITS_VERSION_KEY, time.time_ns(), None)
+    return counts
+
+
+class _ResultBuffer:
+    """
+    result_callback that persists subreddits PERSIST_BATCH_SIZE at a time.
+
+    A full batch is handed off by swapping in a new list rather than
+    copying and clearing the old one. Call flush() once the search ends.
+    """
+
+    def __init__(self, query_run):
+        self.query_run = query_run
+        self.batch_size = settings.PERSIST_BATCH_SIZE
+        self.items = []
+
+    def __call__(self, sub_info):
+        items = self.items
+        items.append(sub_info)
+        if len(items) >= self.batch_size:
+            self.items = []
+            _flush_results(self.query_run, items)
+
+    def flush(self):
+        items, self.items = self.items, []
+        _flush_results(self.query_run, items)
 
 
 @shared_task(bind=True, max_retries=0)
@@ -453,7 +703,7 @@ def run_random_search(self):
         return {'error': 'No keyword'}
 
     # Create job record
-    job_id = uuid.uuid4().hex
+    job_id = secrets.token_hex(16)
     limit = min(settings.RANDOM_SEARCH_LIMIT, settings.PUBLIC_API_LIMIT_CAP)
 
     query_run = QueryRun.objects.create(
@@ -474,13 +724,7 @@ def run_random_search(self):
     logger.info("Starting random search: keyword=%s job_id=%s", keyword, job_id)
 
     try:
-        results_buffer = []
-
-        def persist_result(sub_info):
-            results_buffer.append(sub_info)
-            if len(results_buffer) >= settings.PERSIST_BATCH_SIZE:
-                _flush_results(query_run, results_buffer.copy())
-                results_buffer.clear()
+        persist_result = _ResultBuffer(query_run)
 
         payload = find_unmoderated_subreddits(
             limit=limit,
@@ -494,8 +738,7 @@ def run_random_search(self):
             result_callback=persist_result,
         )
 
-        if results_buffer:
-            _flush_results(query_run, results_buffer)
+        persist_result.flush()
 
         api_results = payload.get('results', []) if isinstance(payload, dict) else payload
         query_run.mark_complete(result_count=len(api_results))
@@ -509,6 +752,17 @@ def run_random_search(self):
         return {'error': str(e)}
 
 
+@functools.lru_cache(maxsize=8)
+def _auto_ingest_plan(keywords):
+    """
+    Pair each configured auto-ingest keyword with its log label.
+
+    Cached per keyword tuple, so the plan is built once per configuration
+    rather than on every scheduled run.
+    """
+    return tuple((keyword, keyword.replace(' ', '-').lower()) for keyword in keywords if keyword)
+
+
 @shared_task(bind=True, max_retries=0)
 def run_auto_ingest(self):
     """
@@ -522,11 +776,12 @@ def run_auto_ingest(self):
         logger.info("Auto-ingest skipped: no keywords configured")
         return {'status': 'skipped', 'reason': 'no keywords configured'}
 
-    for keyword in keywords:
-        if not keyword:
-            continue  # Skip empty keywords
-        job_id = uuid.uuid4().hex
-        label = keyword.replace(' ', '-').lower()
+    # Subreddits already persisted earlier in this sweep; overlapping
+    # keywords skip re-evaluating and re-writing them
+    seen_names = set()
+
+    for keyword, label in _auto_ingest_plan(tuple(keywords)):
+        job_id = secrets.token_hex(16)
 
         query_run = QueryRun.objects.create(
             job_id=job_id,
@@ -546,13 +801,11 @@ def run_auto_ingest(self):
         logger.info("Starting auto-ingest: keyword=%s job_id=%s", label, job_id)
 
         try:
-            results_buffer = []
+            results_buffer = _ResultBuffer(query_run)
 
             def persist_result(sub_info):
-                results_buffer.append(sub_info)
-                if len(results_buffer) >= settings.PERSIST_BATCH_SIZE:
-                    _flush_results(query_run, results_buffer.copy())
-                    results_buffer.clear()
+                seen_names.add((sub_info.get('name') or '').lower())
+                results_buffer(sub_info)
 
             payload = find_unmoderated_subreddits(
                 limit=settings.AUTO_INGEST_LIMIT,
@@ -563,11 +816,11 @@ def run_auto_ingest(self):
                 activity_mode='any',
                 rate_limit_delay=settings.AUTO_INGEST_DELAY,
                 include_all=True,
+                exclude_names=seen_names,
                 result_callback=persist_result,
             )
 
-            if results_buffer:
-                _flush_results(query_run, results_buffer)
+            results_buffer.flush()
 
             api_results = payload.get('results', []) if isinstance(payload, dict) else payload
             query_run.mark_complete(result_count=len(api_results))
@@ -644,7 +897,7 @@ def retry_errored_searches():
     retried = 0
     for job in errored_jobs:
         # Create a new job with the same parameters
-        new_job_id = uuid.uuid4().hex
+        new_job_id = secrets.token_hex(16)
         new_retry_count = job.retry_count + 1
 
         new_job = QueryRun.objects.create(
@@ -739,12 +992,22 @@ def cleanup_broken_nodes():
         broken_since__lt=threshold
     )
 
-    count = broken_nodes.count()
-    for node in broken_nodes:
-        node.soft_delete()
-        logger.info("Removed broken node: %s", node.reddit_username or node.email)
+    # Fetch only what the log needs, then soft-delete with a single UPDATE
+    # instead of loading and saving each node; the partial index on
+    # (health_status, broken_since) keeps both scans small.
+    nodes = list(broken_nodes.values_list('pk', 'reddit_username', 'email'))
+    if not nodes:
+        return {'removed': 0}
+
+    now = timezone.now()
+    count = broken_nodes.filter(pk__in=[pk for pk, _, _ in nodes]).update(
+        is_deleted=True, deleted_at=now, updated_at=now
+    )
+    for _, reddit_username, email in nodes:
+        logger.info("Removed broken node: %s", reddit_username or email)
 
     if count:
+        VolunteerNode.invalidate_cache()
         logger.info("Cleanup removed %d broken nodes", count)
 
     return {'removed': count}
@@ -770,25 +1033,66 @@ def refresh_rolling_stats():
     return stats.to_dict()
 
 
-def _fetch_random_keyword():
-    """Fetch a random word from API or use fallback."""
-    DEFAULT_WORDS = [
-        "atlas", "harbor", "mosaic", "cocoa", "summit",
-        "glow", "orbit", "quartz", "tango", "whistle",
-    ]
+# Strips everything but letters and spaces from random-word API responses
+RANDOM_WORD_UNSAFE_RE = re.compile(r'[^A-Za-z ]')
+
+# Words requested per random-word API call; the extras are kept in
+# _random_words and served to later runs before the API is called again
+RANDOM_WORD_BATCH_SIZE = 16
+DEFAULT_RANDOM_WORDS = (
+    "atlas", "harbor", "mosaic", "cocoa", "summit",
+    "glow", "orbit", "quartz", "tango", "whistle",
+)
+_random_words = []
+_random_words_lock = threading.Lock()
+
+# Keep-alive HTTP session for outbound API calls from this worker, with a
+# small connection pool and a quick retry on transient gateway errors
+_http_session = requests.Session()
+_http_session.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504)),
+))
 
+
+def _fetch_random_keyword():
+    """Return a random word, refilling the buffer from the API or using a fallback."""
+    with _random_words_lock:
+        if not _random_words:
+            _random_words.extend(_fetch_random_words())
+        if _random_words:
+            return _random_words.pop()
+    return random.choice(DEFAULT_RANDOM_WORDS)
+
+
+@functools.lru_cache(maxsize=1)
+def _random_word_batch_url():
+    """RANDOM_WORD_API asking for a whole batch, if it takes a words= count."""
+    parts = urlsplit(settings.RANDOM_WORD_API)
+    query = dict(parse_qsl(parts.query))
+    if 'words' not in query:
+        return settings.RANDOM_WORD_API
+    query['words'] = str(RANDOM_WORD_BATCH_SIZE)
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _fetch_random_words():
+    """Fetch a batch of cleaned random words, or [] if the API is unavailable."""
     try:
-        response = requests.get(settings.RANDOM_WORD_API, timeout=5)
+        response = _http_session.get(_random_word_batch_url(), timeout=5)
         response.raise_for_status()
         data = response.json()
-        if isinstance(data, list) and data:
-            return re.sub(r'[^A-Za-z ]', '', data[0]).strip().lower()
-        if isinstance(data, str):
-            return re.sub(r'[^A-Za-z ]', '', data).strip().lower()
     except Exception:
         logger.debug("Random word fetch failed", exc_info=True)
+        return []
 
-    return random.choice(DEFAULT_WORDS)
+    if isinstance(data, str):
+        data = [data]
+    if not isinstance(data, list):
+        return []
+    words = (RANDOM_WORD_UNSAFE_RE.sub('', word).strip().lower() for word in data if isinstance(word, str))
+    return [word for word in words if word]
 
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=60)
@@ -798,10 +1102,11 @@ def send_completion_notification(self, job_id: str):
 
     This task is called after a job finishes if the user provided an email.
     """
-    import smtplib
     from email.mime.text import MIMEText
     from email.mime.multipart import MIMEMultipart
 
+    from reddit_analyzer.mail import send_message
+
     try:
         query_run = QueryRun.objects.get(job_id=job_id)
     except QueryRun.DoesNotExist:
@@ -814,12 +1119,10 @@ def send_completion_notification(self, job_id: str):
 
     # Check if email settings are configured
     smtp_host = getattr(settings, 'NODE_EMAIL_SMTP_HOST', '')
-    smtp_port = getattr(settings, 'NODE_EMAIL_SMTP_PORT', 587)
     smtp_user = getattr(settings, 'NODE_EMAIL_SMTP_USERNAME', '')
     smtp_pass = getattr(settings, 'NODE_EMAIL_SMTP_PASSWORD', '')
     sender_email = getattr(settings, 'NODE_EMAIL_SENDER', '')
     sender_name = getattr(settings, 'NODE_EMAIL_SENDER_NAME', 'Sub Search')
-    use_tls = getattr(settings, 'NODE_EMAIL_USE_TLS', True)
 
     if not all([smtp_host, smtp_user, smtp_pass, sender_email]):
         logger.warning("Email not configured, skipping notification for job %s", job_id)
@@ -924,15 +1227,8 @@ Download CSV: {download_url}
     msg.attach(MIMEText(html_body, 'html'))
 
     try:
-        if use_tls:
-            server = smtplib.SMTP(smtp_host, smtp_port)
-            server.starttls()
-        else:
-            server = smtplib.SMTP_SSL(smtp_host, smtp_port)
-
-        server.login(smtp_user, smtp_pass)
-        server.sendmail(sender_email, [query_run.notification_email], msg.as_string())
-        server.quit()
+        # Reuses the worker's SMTP session across notifications
+        send_message(msg)
 
         logger.info("Sent completion notification for job %s to %s", job_id, query_run.notification_email)
         return {'sent': True, 'to': query_run.notification_email}
@@ -955,23 +1251,40 @@ def submit_user_search(
     """
     Submit a user search job with HIGH priority.
 
+    An identical search that is still queued or running is reused instead
+    of spending Reddit API quota on a second run, so double submits land
+    on the same job.
+
     Returns the job_id which can be used to track progress.
     """
-    job_id = uuid.uuid4().hex
+    params = {
+        'keyword': keyword,
+        'limit_value': min(limit, settings.PUBLIC_API_LIMIT_CAP),
+        'unmoderated_only': unmoderated_only,
+        'exclude_nsfw': exclude_nsfw,
+        'min_subscribers': min_subs,
+        'activity_mode': activity_mode,
+        'activity_threshold_utc': activity_threshold_utc,
+        'notification_email': notification_email,
+    }
+
+    existing_job_id = QueryRun.objects.filter(
+        source=QueryRun.Source.SUB_SEARCH,
+        state__in=[QueryRun.State.PENDING, QueryRun.State.QUEUED, QueryRun.State.RUNNING],
+        **params,
+    ).values_list('job_id', flat=True).first()
+    if existing_job_id:
+        logger.info("Reusing active user search: job_id=%s keyword=%r", existing_job_id, keyword)
+        return existing_job_id
+
+    job_id = secrets.token_hex(16)
 
     query_run = QueryRun.objects.create(
         job_id=job_id,
         source=QueryRun.Source.SUB_SEARCH,
         state=QueryRun.State.QUEUED,
-        keyword=keyword,
-        limit_value=min(limit, settings.PUBLIC_API_LIMIT_CAP),
-        unmoderated_only=unmoderated_only,
-        exclude_nsfw=exclude_nsfw,
-        min_subscribers=min_subs,
-        activity_mode=activity_mode,
-        activity_threshold_utc=activity_threshold_utc,
         priority=PRIORITY_USER,
-        notification_email=notification_email,
+        **params,
     )
 
     # Submit task with high priority (lower number = higher priority)
@@ -0,0 +1,101 @@
+"""
+Tests for the search app.
+"""
+
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+
+from .models import QueryRun, Subreddit
+
+
+class SubredditBulkUpsertTests(TestCase):
+    """Subreddit.bulk_upsert() inserts new rows and updates existing ones in place."""
+
+    def test_updates_existing_name(self):
+        existing = Subreddit.objects.create(name='Python', title='Old', subscribers=10)
+
+        created, updated = Subreddit.bulk_upsert([
+            {'name': 'python', 'title': 'New', 'subscribers': 20},
+            {'name': 'django', 'title': 'Django', 'subscribers': 5},
+        ])
+
+        self.assertEqual((created, updated), (1, 1))
+        self.assertEqual(Subreddit.objects.count(), 2)
+        existing.refresh_from_db()
+        self.assertEqual(existing.name, 'Python')
+        self.assertEqual(existing.title, 'New')
+        self.assertEqual(existing.subscribers, 20)
+
+
+class QueryRunMarkStoppedTests(TestCase):
+    """QueryRun.mark_stopped() only stops jobs that have not finished."""
+
+    def test_finished_run_is_not_stopped(self):
+        run = QueryRun.objects.create(job_id='finished', state=QueryRun.State.COMPLETE)
+
+        self.assertFalse(run.mark_stopped())
+
+        run.refresh_from_db()
+        self.assertEqual(run.state, QueryRun.State.COMPLETE)
+        self.assertIsNone(run.error)
+
+    def test_running_run_is_stopped(self):
+        run = QueryRun.objects.create(job_id='running', state=QueryRun.State.RUNNING)
+
+        self.assertTrue(run.mark_stopped())
+
+        run.refresh_from_db()
+        self.assertEqual(run.state, QueryRun.State.STOPPED)
+
+
+class SubredditCursorPagingTests(TransactionTestCase):
+    """
+    /api/subreddits next_cursor pages through every row, across ties and
+    with NULLs last.
+
+    The view reads through the readonly alias, a separate connection that
+    only sees committed rows, hence TransactionTestCase.
+    """
+
+    databases = {'default', 'readonly'}
+
+    def setUp(self):
+        cache.clear()
+        for name, title, subscribers in (
+            ('a', 'Bravo', 300),
+            ('b', None, 100),
+            ('c', 'Delta', 100),
+            ('d', 'Charlie', 100),
+            ('e', 'Alpha', 0),
+            ('f', None, 200),
+        ):
+            Subreddit.objects.create(name=name, title=title, subscribers=subscribers)
+
+    def _page_through(self, sort, order):
+        names = []
+        params = {'sort': sort, 'order': order, 'page_size': 2}
+        for _ in range(10):
+            data = self.client.get(reverse('api_subreddits'), params).json()
+            names.extend(row['name'] for row in data['rows'])
+            if not data['next_cursor']:
+                return names
+            params['after'] = data['next_cursor']
+        self.fail('cursor paging did not terminate')
+
+    def test_subscribers_desc(self):
+        self.assertEqual(self._page_through('subscribers', 'desc'), ['a', 'f', 'd', 'c', 'b', 'e'])
+
+    def test_title_asc(self):
+        self.assertEqual(self._page_through('title', 'asc'), ['e', 'a', 'd', 'c', 'b', 'f'])
+
+    def test_cursor_of_wrong_type_is_rejected(self):
+        response = self.client.get(reverse('api_subreddits'), {
+            'sort': 'subscribers',
+            'after': self._cursor_for('title', 'asc'),
+        })
+        self.assertEqual(response.status_code, 400)
+
+    def _cursor_for(self, sort, order):
+        params = {'sort': sort, 'order': order, 'page_size': 2}
+        return self.client.get(reverse('api_subreddits'), params).json()['next_cursor']
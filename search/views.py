@@ -4,28 +4,88 @@ Django views for Reddit Sub Search.
 Includes security hardening, input sanitization, and caching.
 """
 
+import base64
 import csv
 import hashlib
-import io
+import itertools
+import json
 import logging
 import re
+import time
 from datetime import datetime
 
 from django.conf import settings
 from django.contrib import messages
 from django.core.cache import cache
-from django.db.models import Count, Q
-from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.db.models import Count, F, Q
+from django.http import JsonResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.http import parse_etags
 from django.views.decorators.http import require_http_methods, require_GET, require_POST
 
+from reddit_analyzer.caching import cache_is_shared
 from reddit_analyzer.middleware import InputSanitizer
 from .models import QueryRun, Subreddit, RollingStats
-from .tasks import submit_user_search, PRIORITY_USER
+
+try:
+    import orjson
+except ImportError:
+    # Optional - fall back to Django's JSON encoder
+    orjson = None
+from .tasks import submit_user_search, request_stop, get_subreddits_version, PRIORITY_USER
 
 logger = logging.getLogger(__name__)
 
+# Database alias for pure read paths (see settings.DATABASES); only
+# configured for SQLite, read through _read_db()
+READONLY_DB = 'readonly'
+
+# Precompiled patterns used on every form POST / CSV download
+DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+FILENAME_UNSAFE_RE = re.compile(r'[^a-zA-Z0-9_-]')
+
+# Earliest accepted activity date (Reddit's founding year)
+MIN_ACTIVITY_DATE = datetime(2005, 1, 1)
+
+# Cache key for the homepage activity panels
+HOME_ACTIVITY_CACHE_KEY = 'home_activity'
+
+# Columns in job CSV downloads, rows fetched per cursor round trip, and
+# rows encoded per streamed chunk
+CSV_FIELDS = (
+    'display_name_prefixed', 'title', 'public_description', 'subscribers',
+    'mod_count', 'is_unmoderated', 'is_nsfw', 'last_activity_utc',
+    'updated_at', 'url', 'source',
+)
+CSV_CHUNK_SIZE = 2000
+CSV_WRITE_BATCH = 500
+
+# Seconds a filtered /api/subreddits total is reused across pages
+COUNT_CACHE_TIMEOUT = 60
+
+# /api/subreddits output depends only on its query string and is the same for
+# every visitor, so browsers and proxies may reuse it briefly
+SUBREDDITS_CACHE_CONTROL = 'public, max-age=30'
+
+# Upper bound on an /api/subreddits cursor; comfortably fits a 512-character
+# title (the longest sort value) after JSON and base64 encoding
+SUBREDDIT_CURSOR_MAX_LENGTH = 4096
+
+# Python type of each sortable field's value inside a cursor
+SUBREDDIT_CURSOR_TYPES = {
+    'name': str,
+    'title': str,
+    'subscribers': int,
+    'mod_count': int,
+    'last_activity_utc': int,
+    'updated_at': datetime,
+    'first_seen_at': datetime,
+}
+
 
 def home(request):
     """Homepage with sub search form and activity overview."""
@@ -34,9 +94,31 @@ def home(request):
     if request.method == 'POST':
         return _handle_search_submission(request)
 
-    # Get rolling 24h stats and summary stats for Database Stats panel
-    rolling_stats = RollingStats.get_stats()
+    # Get summary stats for Database Stats panel and the cached activity panels
     stats = _get_summary_stats()
+    activity = _get_home_activity()
+
+    return render(request, 'home.html', {
+        'stats': stats,
+        **activity,
+        'job_id': job_id,
+        'nav_active': 'home',
+    })
+
+
+def _get_home_activity():
+    """
+    Get the activity panels shown on the homepage with caching.
+
+    These change at most a few times per minute but cost several queries
+    per page view; the live queue panel is refreshed by /api/queue anyway.
+    """
+    cached = cache.get(HOME_ACTIVITY_CACHE_KEY)
+    if cached:
+        return cached
+
+    # Rolling 24h stats
+    rolling_stats = RollingStats.get_stats()
 
     # Recent user searches - only completed ones (not running/queued)
     recent_user_runs = list(
@@ -55,7 +137,6 @@ def home(request):
     # Node stats
     from nodes.models import VolunteerNode
     node_stats = VolunteerNode.get_stats()
-    volunteer_nodes = list(VolunteerNode.get_active_nodes(limit=6))
 
     # Queue count and queued runs
     queued_runs = list(
@@ -63,20 +144,18 @@ def home(request):
             state__in=[QueryRun.State.PENDING, QueryRun.State.QUEUED]
         ).order_by('started_at')[:5]
     )
-    queue_count = len(queued_runs)
 
-    return render(request, 'home.html', {
-        'stats': stats,
+    activity = {
         'rolling_stats': rolling_stats,
         'recent_user_runs': recent_user_runs,
         'random_run': random_run,
         'node_stats': node_stats,
-        'volunteer_nodes': volunteer_nodes,
-        'queue_count': queue_count,
+        'queue_count': len(queued_runs),
         'queued_runs': queued_runs,
-        'job_id': job_id,
-        'nav_active': 'home',
-    })
+    }
+
+    cache.set(HOME_ACTIVITY_CACHE_KEY, activity, getattr(settings, 'CACHE_TIMEOUT_STATS', 60))
+    return activity
 
 
 def _handle_search_submission(request):
@@ -125,15 +204,13 @@ def _handle_search_submission(request):
     activity_threshold_utc = None
     if activity_enabled and activity_mode in ('active_after', 'inactive_before') and activity_date_raw:
         # Strict date format validation
-        if not re.match(r'^\d{4}-\d{2}-\d{2}$', activity_date_raw):
+        if not DATE_RE.match(activity_date_raw):
             messages.error(request, "Invalid date format. Use YYYY-MM-DD.")
             return redirect('home')
         try:
             dt = datetime.strptime(activity_date_raw, '%Y-%m-%d')
             # Validate reasonable date range (not too far in past or future)
-            now = datetime.now()
-            min_date = datetime(2005, 1, 1)  # Reddit's founding year
-            if dt < min_date or dt > now:
+            if dt < MIN_ACTIVITY_DATE or dt > datetime.now():
                 raise ValueError("Date out of valid range")
             activity_threshold_utc = int(dt.timestamp())
         except Exception:
@@ -159,6 +236,9 @@ def _handle_search_submission(request):
         messages.error(request, "Failed to submit search. Please try again.")
         return redirect('home')
 
+    # Show the new job in the queue panel on the next page load
+    cache.delete(HOME_ACTIVITY_CACHE_KEY)
+
     return redirect('home_with_job', job_id=job_id)
 
 
@@ -178,10 +258,13 @@ def _get_summary_stats():
     if cached:
         return cached
 
-    total_subs = Subreddit.objects.count()
-    last_indexed = Subreddit.objects.order_by('-updated_at').values_list('updated_at', flat=True).first()
-    total_runs = QueryRun.objects.count()
-    last_run = QueryRun.objects.order_by('-started_at').values_list('started_at', flat=True).first()
+    read_db = _read_db()
+    subs = Subreddit.objects.using(read_db)
+    runs = QueryRun.objects.using(read_db)
+    total_subs = subs.count()
+    last_indexed = subs.order_by('-updated_at').values_list('updated_at', flat=True).first()
+    total_runs = runs.count()
+    last_run = runs.order_by('-started_at').values_list('started_at', flat=True).first()
 
     stats = {
         'total_subreddits': total_subs,
@@ -296,34 +379,132 @@ def status(request, job_id):
     if not sanitized_job_id:
         return JsonResponse({'error': 'invalid job id'}, status=400)
 
-    # Check cache first for completed jobs
-    cache_key = f"job_status:{sanitized_job_id}"
+    # Serve the encoded snapshot while it is current. QueryRun drops it on
+    # every progress or state write, so running jobs are cached too when
+    # the cache is shared with the worker.
+    cache_key = QueryRun.status_cache_key(sanitized_job_id)
     cached = cache.get(cache_key)
-    if cached and cached.get('done'):
-        return JsonResponse(cached)
+    if cached:
+        if _etag_matches(request, cached['etag']):
+            return _not_modified(cached['etag'])
+        return _status_response(cached['body'], cached['etag'])
 
     try:
         job = QueryRun.objects.get(job_id=sanitized_job_id)
     except QueryRun.DoesNotExist:
         return JsonResponse({'error': 'unknown job'}, status=404)
 
+    queue_backlog = _get_queue_backlog()
+
+    # Nothing a poller sees has changed - skip building the payload
+    etag = _status_etag(
+        job.job_id, job.state, job.progress_phase, job.checked_count, job.found_count, queue_backlog
+    )
+    if _etag_matches(request, etag):
+        return _not_modified(etag)
+
     data = job.to_status_dict()
 
     # Add queue info
-    queue_count = QueryRun.objects.filter(
-        state__in=[QueryRun.State.PENDING, QueryRun.State.QUEUED]
-    ).count()
-    data['queue_backlog'] = queue_count
+    data['queue_backlog'] = queue_backlog
     data['max_concurrent'] = settings.MAX_CONCURRENT_JOBS
     data['rate_limit_delay'] = settings.RATE_LIMIT_DELAY
 
-    # Cache completed jobs longer
+    # Cache the encoded payload so repeat polls skip the JSON encode
+    body = _encode_json(data)
+    cached = {'done': data.get('done'), 'etag': etag, 'body': body}
+
+    # Cache completed jobs longer; unfinished ones expire with the queue
+    # backlog count they embed. A process-local cache never sees the
+    # worker's invalidations, so unfinished jobs are only cached when shared.
     if data.get('done'):
-        cache.set(cache_key, data, 3600)  # 1 hour for completed jobs
-    else:
-        cache.set(cache_key, data, getattr(settings, 'CACHE_TIMEOUT_JOBS', 30))
+        cache.set(cache_key, cached, 3600)  # 1 hour for completed jobs
+    elif cache_is_shared():
+        cache.set(cache_key, cached, getattr(settings, 'CACHE_TIMEOUT_QUEUE', 5))
+
+    return _status_response(body, etag)
+
+
+def _status_etag(job_id, state, phase, checked, found, queue_backlog):
+    """Build the ETag for a status payload from the fields that change while polling."""
+    return f'"{job_id}-{state}-{phase}-{checked}-{found}-{queue_backlog}"'
+
+
+def _encode_json(data):
+    """Encode a JSON payload to bytes, using orjson when it is installed."""
+    if orjson is None:
+        return json.dumps(data, cls=DjangoJSONEncoder).encode('utf-8')
+    return orjson.dumps(data)
+
+
+def _json_response(data, status=200):
+    """Serialize a JSON API response, using orjson when it is installed."""
+    return HttpResponse(_encode_json(data), content_type='application/json', status=status)
+
+
+def _read_db():
+    """
+    Database alias for pure read queries.
+
+    Uses the read-only alias when it is configured and can connect, and
+    falls back to the default database otherwise.
+    """
+    if READONLY_DB not in settings.DATABASES:
+        return DEFAULT_DB_ALIAS
+    try:
+        connections[READONLY_DB].ensure_connection()
+    except DatabaseError as e:
+        logger.warning("Read-only database unavailable, using default: %s", e)
+        return DEFAULT_DB_ALIAS
+    return READONLY_DB
+
+
+def _etag_matches(request, etag):
+    """Whether If-None-Match matches the ETag, using weak comparison."""
+    header = request.headers.get('If-None-Match')
+    if not header:
+        return False
+    tags = parse_etags(header)
+    if '*' in tags:
+        return True
+    return etag.removeprefix('W/') in {tag.removeprefix('W/') for tag in tags}
+
+
+def _not_modified(etag, cache_control='no-cache'):
+    """Return an empty 304 response for a matching ETag."""
+    response = HttpResponseNotModified()
+    response['ETag'] = etag
+    response['Cache-Control'] = cache_control
+    return response
+
+
+def _status_response(body, etag):
+    """Return an encoded status payload with an ETag so pollers can revalidate cheaply."""
+    response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
+def _get_queue_backlog():
+    """
+    Get the number of pending/queued jobs, shared across status pollers.
+
+    Every poll of every job needs this count, so it is cached briefly
+    instead of running a COUNT per request. QueryRun.save() drops the
+    cached value when a job changes state, so it never lags a transition.
+    """
+    cache_key = QueryRun.QUEUE_BACKLOG_CACHE_KEY
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    queue_count = QueryRun.objects.filter(
+        state__in=[QueryRun.State.PENDING, QueryRun.State.QUEUED]
+    ).count()
 
-    return JsonResponse(data)
+    cache.set(cache_key, queue_count, getattr(settings, 'CACHE_TIMEOUT_QUEUE', 5))
+    return queue_count
 
 
 @require_POST
@@ -339,14 +520,18 @@ def stop_job(request, job_id):
     except QueryRun.DoesNotExist:
         return JsonResponse({'ok': False, 'error': 'unknown job'}, status=404)
 
+    # Repeat clicks on Stop are acknowledged without redoing the work
+    if job.state == QueryRun.State.STOPPED:
+        return JsonResponse({'ok': True, 'message': 'Already stopping'})
+
     if job.is_complete:
         return JsonResponse({'ok': False, 'error': 'already done'}, status=400)
 
-    # Mark as stopped
-    job.mark_stopped()
-
-    # Invalidate job status cache
-    cache.delete(f"job_status:{sanitized_job_id}")
+    # Mark as stopped and signal the running task; only the request that
+    # wins the state transition goes on to revoke the task
+    if not job.mark_stopped():
+        return JsonResponse({'ok': True, 'message': 'Already stopping'})
+    request_stop(job.job_id)
 
     # Try to revoke the Celery task
     if job.celery_task_id:
@@ -377,57 +562,52 @@ def job_download_csv(request, job_id):
     keyword = job.keyword
     if keyword:
         subreddits = Subreddit.objects.filter(
-            Q(name__icontains=keyword) |
-            Q(title__icontains=keyword) |
-            Q(public_description__icontains=keyword)
-        ).order_by('-subscribers')
+            Subreddit.keyword_q(keyword)
+        ).order_by('-subscribers').values_list(*CSV_FIELDS)
     else:
         # No keyword means no results
         subreddits = Subreddit.objects.none()
 
-    if not subreddits.exists():
+    # Peek at the first row instead of running a separate EXISTS query;
+    # iterator() streams rows from the cursor instead of caching the
+    # whole result set on the queryset
+    rows = subreddits.iterator(chunk_size=CSV_CHUNK_SIZE)
+    first = next(rows, None)
+    if first is None:
         return HttpResponse("No matching subreddits found for this keyword.", status=404)
 
-    fieldnames = [
-        'display_name_prefixed', 'title', 'public_description', 'subscribers',
-        'mod_count', 'is_unmoderated', 'is_nsfw', 'last_activity_utc',
-        'updated_at', 'url', 'source'
-    ]
-
     def generate():
-        buffer = io.StringIO()
-        writer = csv.DictWriter(buffer, fieldnames=fieldnames)
-        writer.writeheader()
-        yield buffer.getvalue()
-        buffer.seek(0)
-        buffer.truncate(0)
-
-        for sub in subreddits:
-            row = {
-                'display_name_prefixed': sub.display_name_prefixed,
-                'title': sub.title,
-                'public_description': sub.public_description,
-                'subscribers': sub.subscribers,
-                'mod_count': sub.mod_count,
-                'is_unmoderated': sub.is_unmoderated,
-                'is_nsfw': sub.is_nsfw,
-                'last_activity_utc': sub.last_activity_utc,
-                'updated_at': sub.updated_at.isoformat() if sub.updated_at else None,
-                'url': sub.url,
-                'source': sub.source,
-            }
-            writer.writerow(row)
-            yield buffer.getvalue()
-            buffer.seek(0)
-            buffer.truncate(0)
+        # csv.writer appends encoded lines to the buffer; writerows() encodes
+        # a whole batch in C and each batch goes out as a single chunk
+        buffer = _LineBuffer()
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_FIELDS)
+
+        # Rows arrive as plain tuples in CSV_FIELDS order; only updated_at
+        # needs converting, so splice it rather than rebuilding every field
+        ts = CSV_FIELDS.index('updated_at')
+        subs = itertools.chain((first,), rows)
+        while batch := list(itertools.islice(subs, CSV_WRITE_BATCH)):
+            writer.writerows(
+                row[:ts] + (row[ts].isoformat() if row[ts] else None,) + row[ts + 1:]
+                for row in batch
+            )
+            yield ''.join(buffer)
+            buffer.clear()
 
     response = StreamingHttpResponse(generate(), content_type='text/csv')
     # Use keyword in filename for clarity
-    safe_keyword = re.sub(r'[^a-zA-Z0-9_-]', '_', keyword or 'all')[:30]
+    safe_keyword = FILENAME_UNSAFE_RE.sub('_', keyword or 'all')[:30]
     response['Content-Disposition'] = f'attachment; filename=subsearch_{safe_keyword}.csv'
     return response
 
 
+class _LineBuffer(list):
+    """List that csv.writer can write to, collecting encoded lines for streaming."""
+
+    write = list.append
+
+
 @require_GET
 def api_recent_runs(request):
     """Get recent runs as JSON."""
@@ -435,16 +615,17 @@ def api_recent_runs(request):
     source_filter = request.GET.get('source', '')
 
     # Build query based on source filter
+    runs_qs = QueryRun.objects.using(_read_db())
     if source_filter == 'random':
-        queryset = QueryRun.objects.filter(source=QueryRun.Source.AUTO_RANDOM)
+        queryset = runs_qs.filter(source=QueryRun.Source.AUTO_RANDOM)
     elif source_filter == 'manual':
-        queryset = QueryRun.objects.filter(source=QueryRun.Source.SUB_SEARCH)
+        queryset = runs_qs.filter(source=QueryRun.Source.SUB_SEARCH)
     else:
-        queryset = QueryRun.objects.filter(source=QueryRun.Source.SUB_SEARCH)
+        queryset = runs_qs.filter(source=QueryRun.Source.SUB_SEARCH)
 
     runs = queryset.filter(completed_at__isnull=False).order_by('-completed_at')[:limit]
 
-    return JsonResponse({
+    return _json_response({
         'runs': [
             {
                 'job_id': r.job_id,
@@ -468,33 +649,35 @@ def api_queue(request):
     # Get currently running job
     running_job = QueryRun.objects.filter(state=QueryRun.State.RUNNING).first()
 
-    # Get queued jobs - user jobs first (priority 0), then auto jobs (priority 9)
+    # Get queued jobs - user jobs first (priority 0), then auto jobs (priority 9).
+    # Only jobs with keywords are listed (no "all subreddits" searches); that
+    # filter runs in SQL so the LIMIT applies to the rows actually shown.
     queued_jobs = QueryRun.objects.filter(
         state__in=[QueryRun.State.PENDING, QueryRun.State.QUEUED]
-    ).order_by('priority', 'started_at')[:limit]
+    ).exclude(
+        Q(keyword__isnull=True) | Q(keyword='')
+    ).order_by('priority', 'started_at').values_list(
+        'job_id', 'keyword', 'limit_value', 'source', 'priority'
+    )[:limit]
 
     # Calculate average job time
     avg_time = _calculate_average_job_time()
 
     queue_items = []
-    for idx, job in enumerate(queued_jobs):
-        # Only include jobs with keywords (no "all subreddits" searches)
-        if not job.keyword:
-            continue
-
+    for idx, (job_id, keyword, limit_value, source, priority) in enumerate(queued_jobs):
         eta_start = int(idx * avg_time)
         eta_completion = int((idx + 1) * avg_time)
 
         queue_items.append({
-            'job_id': job.job_id,
-            'keyword': job.keyword,
-            'limit': job.limit_value,
-            'source': job.source,
-            'priority': job.priority,
+            'job_id': job_id,
+            'keyword': keyword,
+            'limit': limit_value,
+            'source': source,
+            'priority': priority,
             'position': idx + 1,
             'eta_start_seconds': eta_start,
             'eta_completion_seconds': eta_completion,
-            'is_manual': job.source == QueryRun.Source.SUB_SEARCH,
+            'is_manual': source == QueryRun.Source.SUB_SEARCH,
         })
 
     # Build running job info
@@ -510,7 +693,7 @@ def api_queue(request):
             'is_manual': running_job.source == QueryRun.Source.SUB_SEARCH,
         }
 
-    return JsonResponse({
+    return _json_response({
         'running': running_info,
         'queue': queue_items,
         'total_queued': len(queue_items),
@@ -522,23 +705,27 @@ def api_queue(request):
 def api_subreddits(request):
     """Search subreddits API endpoint with caching and input sanitization."""
     # Sanitize and validate inputs
-    q = InputSanitizer.sanitize_keyword(request.GET.get('q', ''))
-    unmoderated = _parse_bool(request.GET.get('unmoderated'))
-    nsfw = _parse_bool(request.GET.get('nsfw'))
+    get = request.GET.get
+    q = InputSanitizer.sanitize_keyword(get('q', ''))
+    unmoderated = _parse_bool(get('unmoderated'))
+    nsfw = _parse_bool(get('nsfw'))
     min_subs = InputSanitizer.sanitize_integer(
-        request.GET.get('min_subs'), min_val=0, max_val=100_000_000, default=None
+        get('min_subs'), min_val=0, max_val=100_000_000, default=None
     )
     max_subs = InputSanitizer.sanitize_integer(
-        request.GET.get('max_subs'), min_val=0, max_val=100_000_000, default=None
+        get('max_subs'), min_val=0, max_val=100_000_000, default=None
     )
-    page = max(InputSanitizer.sanitize_integer(request.GET.get('page'), default=1), 1)
+    page = max(InputSanitizer.sanitize_integer(get('page'), default=1), 1)
     page_size = min(max(InputSanitizer.sanitize_integer(
-        request.GET.get('page_size'), default=50
+        get('page_size'), default=50
     ), 1), 200)
-    sort = request.GET.get('sort', 'subscribers') or 'subscribers'
-    order = request.GET.get('order', 'desc') or 'desc'
-    job_id_raw = request.GET.get('job_id', '').strip()
+    sort = get('sort', 'subscribers') or 'subscribers'
+    order = get('order', 'desc') or 'desc'
+    job_id_raw = get('job_id', '').strip()
     job_id = InputSanitizer.sanitize_job_id(job_id_raw) if job_id_raw else ''
+    after = get('after', '').strip()
+    if len(after) > SUBREDDIT_CURSOR_MAX_LENGTH:
+        return _json_response({'error': 'invalid cursor'}, status=400)
 
     # Validate sort field (prevent SQL injection via sort)
     # Map frontend field names to database field names
@@ -554,17 +741,27 @@ def api_subreddits(request):
     if order.lower() not in ('asc', 'desc'):
         order = 'desc'
 
-    # Generate cache key based on query parameters
-    cache_params = f"{q}:{unmoderated}:{nsfw}:{min_subs}:{max_subs}:{page}:{page_size}:{sort}:{order}:{job_id}"
-    cache_key = f"api_subreddits:{hashlib.md5(cache_params.encode()).hexdigest()}"
+    # Generate cache key based on query parameters and the data version, so
+    # persisting new results invalidates cached pages. The time bucket bounds
+    # staleness to the cache timeout when the version key is process-local.
+    cache_timeout = getattr(settings, 'CACHE_TIMEOUT_SUBREDDITS', 300)
+    version = f"{get_subreddits_version()}:{int(time.time() // cache_timeout)}"
+    cache_params = f"{q}:{unmoderated}:{nsfw}:{min_subs}:{max_subs}:{page}:{page_size}:{sort}:{order}:{job_id}:{after}"
+    digest = hashlib.md5(f"{version}:{cache_params}".encode()).hexdigest()
+    cache_key = f"api_subreddits:{digest}"
+
+    # Client already has this page - skip the cache lookup and query
+    etag = f'"{digest}"'
+    if _etag_matches(request, etag):
+        return _not_modified(etag, SUBREDDITS_CACHE_CONTROL)
 
     # Try to get from cache
     cached = cache.get(cache_key)
     if cached:
-        return JsonResponse(cached)
+        return _subreddits_response(cached, etag)
 
     # Build queryset
-    qs = Subreddit.objects.all()
+    qs = Subreddit.objects.using(_read_db())
 
     if q:
         # Use icontains which is safe from SQL injection
@@ -583,63 +780,153 @@ def api_subreddits(request):
         qs = qs.filter(subscribers__lte=max_subs)
 
     if job_id:
-        try:
-            job = QueryRun.objects.get(job_id=job_id)
-            qs = qs.filter(last_seen_run=job)
-        except QueryRun.DoesNotExist:
-            result = {'total': 0, 'page': page, 'page_size': page_size, 'rows': []}
-            cache.set(cache_key, result, getattr(settings, 'CACHE_TIMEOUT_SUBREDDITS', 300))
-            return JsonResponse(result)
+        # Join on the indexed job_id rather than fetching the run first;
+        # an unknown job simply matches no rows
+        qs = qs.filter(last_seen_run__job_id=job_id)
 
-    # Sorting - use validated sort field
+    # Sorting - use validated sort field, with id as a tiebreaker so the
+    # order is total and keyset cursors are stable. Only nullable fields
+    # need NULLS LAST; plain ordering on the rest matches their indexes.
     sort_field = sort if sort in valid_sort_fields else 'subscribers'
-    if order.lower() == 'asc':
-        qs = qs.order_by(sort_field)
+    descending = order.lower() != 'asc'
+    nullable = Subreddit._meta.get_field(sort_field).null
+    if not nullable:
+        qs = qs.order_by(f'-{sort_field}', '-id') if descending else qs.order_by(sort_field, 'id')
+    elif descending:
+        qs = qs.order_by(F(sort_field).desc(nulls_last=True), '-id')
     else:
-        qs = qs.order_by(f'-{sort_field}')
-
-    # Pagination with query optimization
-    # Use select_related/prefetch_related if needed
-    total = qs.count()
-    offset = (page - 1) * page_size
-
-    # Limit maximum offset to prevent performance issues
-    max_offset = 10000
-    if offset > max_offset:
-        result = {
-            'total': total,
-            'page': page,
-            'page_size': page_size,
-            'rows': [],
-            'error': f'Page too deep. Maximum offset is {max_offset}.',
-        }
-        return JsonResponse(result)
+        qs = qs.order_by(F(sort_field).asc(nulls_last=True), 'id')
+
+    # The total only depends on the filters, so share it across pages and
+    # sort orders instead of re-running COUNT(*) for every page request
+    count_params = f"{q}:{unmoderated}:{nsfw}:{min_subs}:{max_subs}:{job_id}"
+    count_key = "api_subreddits_count:" + hashlib.md5(
+        f"{version}:{count_params}".encode()
+    ).hexdigest()
+    total = cache.get(count_key)
+    if total is None:
+        total = qs.count()
+        cache.set(count_key, total, COUNT_CACHE_TIMEOUT)
+
+    if after:
+        # Keyset pagination: seek past the last row of the previous page
+        # instead of scanning and discarding OFFSET rows
+        cursor = _decode_subreddit_cursor(after, sort_field)
+        if cursor is None or (cursor[0] is None and not nullable):
+            return _json_response({'error': 'invalid cursor'}, status=400)
+        qs = qs.filter(_keyset_q(sort_field, descending, *cursor, nullable=nullable))
+        offset = 0
+        # Cursor pages have no page number
+        page = None
+    else:
+        offset = (page - 1) * page_size
+
+        # Limit maximum offset to prevent performance issues
+        max_offset = 10000
+        if offset > max_offset:
+            result = {
+                'total': total,
+                'page': page,
+                'page_size': page_size,
+                'rows': [],
+                'error': f'Page too deep. Maximum offset is {max_offset}. Use the next_cursor to go further.',
+            }
+            return _json_response(result)
 
-    rows = list(qs.only(
-        'name', 'display_name_prefixed', 'title', 'public_description',
-        'url', 'subscribers', 'is_unmoderated', 'is_nsfw',
-        'last_activity_utc', 'mod_count', 'source', 'first_seen_at', 'updated_at'
-    )[offset:offset + page_size])
+    rows = list(qs.values_list('id', *Subreddit.API_FIELDS)[offset:offset + page_size])
+
+    next_cursor = None
+    if len(rows) == page_size:
+        last = rows[-1]
+        next_cursor = _encode_subreddit_cursor(
+            last[1 + Subreddit.API_FIELDS.index(sort_field)], last[0]
+        )
 
     result = {
         'total': total,
         'page': page,
         'page_size': page_size,
-        'rows': [sub.to_dict() for sub in rows],
+        'rows': [Subreddit.row_to_dict(row[1:]) for row in rows],
+        'next_cursor': next_cursor,
     }
 
     # Cache the result
-    cache.set(cache_key, result, getattr(settings, 'CACHE_TIMEOUT_SUBREDDITS', 300))
+    cache.set(cache_key, result, cache_timeout)
+
+    return _subreddits_response(result, etag)
+
 
-    return JsonResponse(result)
+def _encode_subreddit_cursor(value, pk):
+    """Encode the sort value and id of a page's last row as an opaque cursor."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return base64.urlsafe_b64encode(
+        json.dumps([value, pk], ensure_ascii=False).encode()
+    ).decode()
+
+
+def _decode_subreddit_cursor(token, sort_field):
+    """Decode a cursor into (sort value, id), or None if it is malformed."""
+    try:
+        value, pk = json.loads(base64.urlsafe_b64decode(token.encode()))
+    except (ValueError, TypeError):
+        return None
+    if not isinstance(pk, int) or isinstance(pk, bool):
+        return None
+    if value is None:
+        return value, pk
+    expected = SUBREDDIT_CURSOR_TYPES[sort_field]
+    if expected is datetime:
+        try:
+            value = parse_datetime(value) if isinstance(value, str) else None
+        except ValueError:
+            return None
+        if value is None:
+            return None
+    elif not isinstance(value, expected) or isinstance(value, bool):
+        return None
+    return value, pk
+
+
+def _keyset_q(field, descending, value, pk, nullable=True):
+    """Rows after (value, pk) in the (field, id) order, with NULLs sorted last."""
+    if value is None:
+        return Q(**{f'{field}__isnull': True, 'id__lt' if descending else 'id__gt': pk})
+    beyond = 'lt' if descending else 'gt'
+    if not nullable:
+        # The leading range bound lets the index seek to the cursor
+        return Q(**{f'{field}__{beyond}e': value}) & (
+            Q(**{f'{field}__{beyond}': value}) | Q(**{f'id__{beyond}': pk})
+        )
+    return (
+        Q(**{f'{field}__{beyond}': value}) |
+        Q(**{field: value, f'id__{beyond}': pk}) |
+        Q(**{f'{field}__isnull': True})
+    )
+
+
+def _subreddits_response(data, etag):
+    """Return an /api/subreddits page with an ETag for conditional polling."""
+    response = _json_response(data)
+    response['ETag'] = etag
+    response['Cache-Control'] = SUBREDDITS_CACHE_CONTROL
+    return response
 
 
 def _calculate_average_job_time():
-    """Calculate average job completion time with caching."""
-    cache_key = 'avg_job_time'
+    """
+    Calculate average job completion time with caching.
+
+    With a shared cache the database average only seeds the cache; after
+    that QueryRun.mark_complete() folds each finished search into it as a
+    moving average, so the aggregate is not re-run every few minutes.
+    A process-local cache never sees the worker's updates, so there the
+    average is simply recomputed every few minutes.
+    """
+    cache_key = QueryRun.AVG_JOB_TIME_CACHE_KEY
     cached = cache.get(cache_key)
     if cached is not None:
-        return cached
+        return round(cached)
 
     from django.db.models import Avg
 
@@ -650,10 +937,14 @@ def _calculate_average_job_time():
         duration_ms__lt=600000,  # Less than 10 minutes
     ).aggregate(avg=Avg('duration_ms'))['avg']
 
-    result = int(avg / 1000) if avg else 60  # Convert to seconds, default 60
+    result = avg / 1000 if avg else 60.0  # Convert to seconds, default 60
 
-    cache.set(cache_key, result, 300)  # Cache for 5 minutes
-    return result
+    if cache_is_shared():
+        timeout = QueryRun.AVG_JOB_TIME_TIMEOUT
+    else:
+        timeout = QueryRun.AVG_JOB_TIME_LOCAL_TIMEOUT
+    cache.set(cache_key, result, timeout)
+    return round(result)
 
 
 def _parse_bool(value):
@@ -668,13 +959,22 @@ def _parse_bool(value):
     return None
 
 
+FAVICON_SVG = (
+    "<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 64 64'>"
+    "<defs><radialGradient id='g' cx='50%' cy='50%' r='60%'>"
+    "<stop offset='0%' stop-color='#22d3ee'/><stop offset='100%' stop-color='#7c3aed'/></radialGradient></defs>"
+    "<rect width='64' height='64' rx='14' fill='url(#g)'/>"
+    "<circle cx='32' cy='32' r='10' fill='white' opacity='0.9'/></svg>"
+).encode('utf-8')
+FAVICON_ETAG = f'"{hashlib.md5(FAVICON_SVG).hexdigest()}"'
+
+
 def favicon(request):
     """Serve inline SVG favicon."""
-    svg = (
-        "<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 64 64'>"
-        "<defs><radialGradient id='g' cx='50%' cy='50%' r='60%'>"
-        "<stop offset='0%' stop-color='#22d3ee'/><stop offset='100%' stop-color='#7c3aed'/></radialGradient></defs>"
-        "<rect width='64' height='64' rx='14' fill='url(#g)'/>"
-        "<circle cx='32' cy='32' r='10' fill='white' opacity='0.9'/></svg>"
-    )
-    return HttpResponse(svg, content_type='image/svg+xml')
+    cache_control = 'public, max-age=31536000, immutable'
+    if _etag_matches(request, FAVICON_ETAG):
+        return _not_modified(FAVICON_ETAG, cache_control)
+    response = HttpResponse(FAVICON_SVG, content_type='image/svg+xml')
+    response['ETag'] = FAVICON_ETAG
+    response['Cache-Control'] = cache_control
+    return response
@@ -24,9 +24,13 @@ import prawcore
 logger = logging.getLogger(__name__)
 
 
+# Separators between query tokens
+TOKEN_SPLIT_RE = re.compile(r"[^a-zA-Z0-9_]+")
+
+
 def _tokenize(query: str) -> List[str]:
     """Split query into alphanumeric tokens."""
-    return [t for t in re.split(r"[^a-zA-Z0-9_]+", query or "") if t]
+    return [t for t in TOKEN_SPLIT_RE.split(query or "") if t]
 
 
 def _safe_iterate(gen, logger_msg: str = "API iteration", max_items: int = 0):